@@ -32,3 +32,31 @@ VIEW_CART_BUTTON = '[id*="view-cart"]'
 
 """ VIEW CART PAGE """
 CART_PRODUCT_TITLE = '.sc-product-title'
+
+
+""" PAGES """
+# every page's url pattern and the selectors it shows once loaded, checked in one go by helpers.selector_health.
+# Selectors that only show up sometimes (banners, badges) or after an action are left out.
+# 'check_url' is opened by the standalone health check (tests/health), pages without one are only checked in tests
+PAGES = {
+    'amazon home': {
+        'url': r'^https://www\.amazon\.com/?(\?.*)?$',
+        'check_url': 'https://www.amazon.com/',
+        'selectors': {'INPUT_SCOPE': INPUT_SCOPE, 'INPUT_FIELD': INPUT_FIELD,
+                      'INPUT_SEARCH_BUTTON': INPUT_SEARCH_BUTTON, 'CART_ICON': CART_ICON},
+    },
+    'amazon results': {
+        'url': r'^https://www\.amazon\.com/s[/?]',
+        'check_url': 'https://www.amazon.com/s?k=teacups',
+        'selectors': {'INPUT_FIELD': INPUT_FIELD, 'UPPER_RESULT_INFO': UPPER_RESULT_INFO,
+                      'RESULTS_CONTAINER': RESULTS_CONTAINER, 'NEXT_BUTTON': NEXT_BUTTON},
+    },
+    'amazon product': {
+        'url': r'^https://www\.amazon\.com/(.*/)?dp/',
+        'selectors': {'PRODUCT_TITLE': PRODUCT_TITLE, 'ADD_TO_CART_BUTTON': ADD_TO_CART_BUTTON},
+    },
+    'amazon cart': {
+        'url': r'^https://www\.amazon\.com/(gp/)?cart',
+        'selectors': {'CART_PRODUCT_TITLE': CART_PRODUCT_TITLE},
+    },
+}
@@ -8,3 +8,19 @@ INPUT_FIELD = 'input[title="Search"]'
 RESULT_STATS = '#result-stats'
 # links at end of search results that show more results
 NAVIGATION_PAGES = '#navcnt [aria-label$="{}"]'
+
+
+# ----- pages ----- #
+# every page's url pattern and the selectors it shows once loaded, see app_data/selectors/amazon.py
+PAGES = {
+    'google home': {
+        'url': r'^https://www\.google\.com/?(\?.*)?$',
+        'check_url': 'https://www.google.com/',
+        'selectors': {'INPUT_FIELD': INPUT_FIELD},
+    },
+    'google results': {
+        'url': r'^https://www\.google\.com/search\?',
+        'check_url': 'https://www.google.com/search?q=cat+pictures',
+        'selectors': {'INPUT_FIELD': INPUT_FIELD, 'RESULT_STATS': RESULT_STATS},
+    },
+}
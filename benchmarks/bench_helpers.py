@@ -0,0 +1,259 @@
+"""
+Microbenchmarks for the helpers, run against helpers.fake_driver so no browser is needed.
+
+Reports, per helper call, how many times a wait polled its condition, how many webdriver commands were
+sent, the bytes of registered scripts (helpers.scripts) sent vs sending them inline, and the wall & cpu time
+spent. With --latency 0 the cpu time is the python side cost of a helper.
+
+    python -m benchmarks.bench_helpers --iterations 20 --latency 0.001
+"""
+import argparse
+import time
+from contextlib import contextmanager
+
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.wait import WebDriverWait
+
+from app_data.general.general import ENTER_KEY
+from app_data.selectors.amazon import INPUT_FIELD, INPUT_SEARCH_BUTTON, RESULTS_CONTAINER
+from helpers import amazon, dom, scripts, scroll, wait
+from helpers.dom import ElementCriteriaCondition
+from helpers.fake_driver import FakeDriver, FakeElement
+
+# seconds simulated pages take to show content after an action, less than one WebDriverWait poll
+CONTENT_DELAY = 0.2
+SEARCH_TERM = 'teacups'
+PRODUCT_NAME = 'Porcelain Teacup Set'
+
+
+"""
+Simulated pages
+"""
+def amazon_home_page():
+    def show_results(driver, element, value):
+        if ENTER_KEY in value:
+            driver.document.append(amazon_results(driver.elapsed() + CONTENT_DELAY))
+
+    return FakeElement('html', children=[
+        FakeElement('title', 'Amazon.com'),
+        FakeElement('input', attributes={'id': 'twotabsearchtextbox'}, on_send_keys=show_results),
+        FakeElement('input', attributes={'class': 'nav-input'}),
+    ])
+
+
+def amazon_results(appear_after=0):
+    return FakeElement('div', attributes={'class': 's-search-results'}, appear_after=appear_after, children=[
+        FakeElement('div', attributes={'cel_widget_id': 'UPPER-RESULT_INFO_BAR'}, children=[
+            FakeElement('span', '1-48 of over 30,000 results for "{}"'.format(SEARCH_TERM),
+                        attributes={'class': 'sg-col-inner'})
+        ])
+    ] + [FakeElement('div', 'result {}'.format(i), attributes={'class': 's-result-item'}) for i in range(48)])
+
+
+def amazon_product_page():
+    def stale_click(driver, element):
+        raise StaleElementReferenceException('button re-rendered')
+
+    def show_view_cart_buttons(driver, element):
+        driver.document.append(FakeElement('a', attributes={'id': 'hlb-view-cart'}, on_click=stale_click))
+        driver.document.append(FakeElement('a', attributes={'id': 'nav-view-cart'},
+                                           on_click=lambda d, e: d.set_document(amazon_cart_page())))
+
+    return FakeElement('html', children=[
+        FakeElement('span', PRODUCT_NAME, attributes={'id': 'productTitle'}),
+        FakeElement('input', attributes={'id': 'add-to-cart-button'}, appear_after=CONTENT_DELAY,
+                    on_click=show_view_cart_buttons),
+    ])
+
+
+def amazon_cart_page():
+    return FakeElement('html', children=[FakeElement('span', PRODUCT_NAME, attributes={'class': 'sc-product-title'})])
+
+
+def many_items_page(count=500):
+    return FakeElement('html', children=[
+        FakeElement('li', 'item {}'.format(i), attributes={'class': 'item'}, displayed=i % 2 == 0)
+        for i in range(count)
+    ])
+
+
+def scrolling_list_page(count=60, item_height=50, viewport_height=500):
+    """
+    A scrollable container of `count` items stacked vertically. Wheel events move its scrollTop.
+    """
+    container = FakeElement('ul', attributes={'id': 'list'}, rect={'x': 0, 'y': 0, 'width': 300,
+                                                                    'height': viewport_height})
+    max_scroll = count * item_height - viewport_height
+    container.properties.update({'scrollTop': 0, 'scrollLeft': 0, 'scrollHeight': count * item_height,
+                                 'scrollWidth': 300, 'clientHeight': viewport_height, 'clientWidth': 300})
+
+    def item_rect(index):
+        return lambda element: {'x': 0, 'y': index * item_height - container.properties['scrollTop'],
+                                'width': 300, 'height': item_height}
+
+    for i in range(count):
+        container.append(FakeElement('li', 'item {}'.format(i), attributes={'class': 'item'}, rect=item_rect(i)))
+
+    def wheel(driver, element, delta_y, delta_x):
+        element.properties['scrollTop'] = min(max(element.properties['scrollTop'] + delta_y, 0), max_scroll)
+
+    def wheel_to_extreme(driver, element, start, horizontal):
+        element.properties['scrollTop'] = 0 if start else max_scroll
+
+    def scroll_to(driver, element, position, horizontal):
+        if position is not None:
+            element.properties['scrollTop'] = min(max(position, 0), max_scroll)
+        return {'position': element.properties['scrollTop'], 'size': count * item_height, 'client': viewport_height}
+
+    return FakeElement('html', children=[container]), [
+        (scroll.SCROLL_TO_SCRIPT, scroll_to),
+        ('MIN_SAFE_INTEGER', wheel_to_extreme),
+        ('WheelEvent', wheel),
+        ('requestAnimationFrame', lambda driver: None),
+    ]
+
+
+"""
+Benchmark cases: name -> (setup returning a driver, helper call taking the driver)
+"""
+def _driver(document, latency, hooks=()):
+    driver = FakeDriver(document, latency=latency)
+    for pattern, function in hooks:
+        driver.add_script_hook(pattern, function)
+    return driver
+
+
+def _scroll_driver(latency):
+    document, hooks = scrolling_list_page()
+    return _driver(document, latency, hooks)
+
+
+def _results_driver(latency):
+    driver = _driver(amazon_home_page(), latency)
+    driver.document.append(amazon_results())
+    return driver
+
+
+CASES = {
+    'ElementCriteriaCondition (500 elements)': (
+        lambda latency: _driver(many_items_page(), latency),
+        lambda driver: ElementCriteriaCondition((By.CSS_SELECTOR, '.item'), return_all_matching=True)(driver)),
+    'dom.get_element (present)': (
+        lambda latency: _driver(amazon_home_page(), latency),
+        lambda driver: dom.get_element(driver, INPUT_FIELD)),
+    'dom.get_elements (500 elements, text)': (
+        lambda latency: _driver(many_items_page(), latency),
+        lambda driver: dom.get_elements(driver, '.item', text='item 4')),
+    'dom.click_element': (
+        lambda latency: _driver(amazon_home_page(), latency),
+        lambda driver: dom.click_element(driver, INPUT_SEARCH_BUTTON)),
+    'wait.until_visible (appears later)': (
+        lambda latency: _driver(FakeElement('html', children=[amazon_results(CONTENT_DELAY)]), latency),
+        lambda driver: wait.until_visible(driver, RESULTS_CONTAINER)),
+    'wait.until_page_title_is': (
+        lambda latency: _driver(amazon_home_page(), latency),
+        lambda driver: wait.until_page_title_is(driver, 'Amazon.com')),
+    'scroll.scroll_until_visible (60 items)': (
+        _scroll_driver,
+        lambda driver: scroll.scroll_until_visible(driver, driver.find_element(By.ID, 'list'), '.item',
+                                                   delta_px=100, text='item 45')),
+    'scroll.scroll_until_visible jump (60 items)': (
+        _scroll_driver,
+        lambda driver: scroll.scroll_until_visible(driver, driver.find_element(By.ID, 'list'), '.item',
+                                                   text='item 45', strategy=scroll.JUMP, item_size_px=50)),
+    'amazon.do_search': (
+        lambda latency: _driver(amazon_home_page(), latency),
+        lambda driver: amazon.do_search(driver, SEARCH_TERM)),
+    'amazon.verify_search_result_summary': (
+        _results_driver,
+        lambda driver: amazon.verify_search_result_summary(driver, 1, 48, SEARCH_TERM)),
+    'amazon.add_to_cart': (
+        lambda latency: _driver(amazon_product_page(), latency),
+        amazon.add_to_cart),
+    'amazon.go_to_cart': (
+        lambda latency: _driver(amazon_product_page(), latency),
+        lambda driver: (amazon.add_to_cart(driver), amazon.go_to_cart(driver))),
+    'amazon.verify_items_in_cart': (
+        lambda latency: _driver(amazon_cart_page(), latency),
+        lambda driver: amazon.verify_items_in_cart(driver, PRODUCT_NAME)),
+}
+
+
+@contextmanager
+def count_polls(stats):
+    """
+    Counts every time a WebDriverWait evaluates its condition while in the context
+
+    :param stats: dict, 'polls' is incremented
+    """
+    original_until = WebDriverWait.until
+
+    def until(self, method, message=''):
+        def counted_method(driver):
+            stats['polls'] += 1
+            return method(driver)
+
+        return original_until(self, counted_method, message)
+
+    WebDriverWait.until = until
+    try:
+        yield stats
+    finally:
+        WebDriverWait.until = original_until
+
+
+def run_case(setup, call, iterations=10, latency=0.0):
+    """
+    Runs a helper call against a freshly simulated page `iterations` times
+
+    :param setup: function, takes the latency and returns a FakeDriver
+    :param call: function, takes the driver and calls the helper
+    :param iterations: int, number of calls
+    :param latency: float, seconds every webdriver command takes
+    :return: dict, per call averages of polls, commands, script bytes, wall & cpu time (ms)
+    """
+    totals = {'polls': 0, 'commands': 0, 'wall': 0.0, 'cpu': 0.0}
+    scripts.stats.clear()
+    for _ in range(iterations):
+        driver = setup(latency)
+        driver.commands.clear()
+        driver.reset_clock()
+
+        with count_polls(totals):
+            wall_started, cpu_started = time.perf_counter(), time.process_time()
+            call(driver)
+            totals['wall'] += time.perf_counter() - wall_started
+            totals['cpu'] += time.process_time() - cpu_started
+        totals['commands'] += sum(driver.commands.values())
+
+    return {
+        'polls': totals['polls'] / iterations,
+        'commands': totals['commands'] / iterations,
+        'script_bytes': scripts.stats['bytes_sent'] / iterations,
+        'inline_script_bytes': scripts.stats['bytes_inline'] / iterations,
+        'wall_ms': totals['wall'] * 1000 / iterations,
+        'cpu_ms': totals['cpu'] * 1000 / iterations,
+    }
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=10, help='calls per helper')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds each webdriver command takes')
+    parser.add_argument('--only', default='', help='only run helpers whose name contains this text')
+    options = parser.parse_args(args)
+
+    row = '{:<42} {:>8} {:>10} {:>16} {:>10} {:>10}'
+    print(row.format('helper', 'polls', 'commands', 'script KB/inline', 'wall ms', 'cpu ms'))
+    for name, (setup, call) in CASES.items():
+        if options.only not in name:
+            continue
+        result = run_case(setup, call, options.iterations, options.latency)
+        print(row.format(name, '{:.1f}'.format(result['polls']), '{:.1f}'.format(result['commands']),
+                         '{:.1f}/{:.1f}'.format(result['script_bytes'] / 1024, result['inline_script_bytes'] / 1024),
+                         '{:.2f}'.format(result['wall_ms']), '{:.2f}'.format(result['cpu_ms'])))
+
+
+if __name__ == '__main__':
+    main()
@@ -10,7 +10,16 @@ import sys
 
 sys.path.insert(0, os.path.abspath(os.getcwd()))
 
-DEFAULT_RESOLUTION = "1024, 768"
+from helpers import accelerate, memory, perf, scripts, selector_health  # noqa: E402
+from helpers.driver_pool import DriverPool, chrome_factory, configure_chrome_options  # noqa: E402
+
+DEFAULT_WARM_POOL_SIZE = 2
+DEFAULT_WEB_VITALS_STORE = os.path.join('.perf', 'web_vitals.json')
+DEFAULT_SOAK_SAMPLE_EVERY = 10
+DEFAULT_SOAK_OUTPUT = os.path.join('.perf', 'soak.csv')
+DEFAULT_DURATIONS_STORE = os.path.join('.perf', 'durations.json')
+# parameter pytest-repeat adds to every repeated test
+REPEAT_PARAMETER = '__pytest_repeat_step_number'
 
 
 def pytest_addoption(parser):
@@ -24,6 +33,261 @@ def pytest_addoption(parser):
         action="store_true",
         help="Specifies to run test in headless mode."
     )
+    parser.addoption(
+        "--warm-start",
+        action="store_true",
+        help="Launches Chrome browsers in the background ahead of the tests that use them."
+    )
+    parser.addoption(
+        "--warm-pool-size",
+        type=int,
+        default=DEFAULT_WARM_POOL_SIZE,
+        help="Number of browsers kept ready when --warm-start is specified."
+    )
+    parser.addoption(
+        "--web-vitals",
+        action="store_true",
+        help="Collects performance data for every page visited and checks the URL dict's perf_thresholds."
+    )
+    parser.addoption(
+        "--web-vitals-store",
+        default=DEFAULT_WEB_VITALS_STORE,
+        help="JSON file performance data is aggregated in across runs when --web-vitals is specified."
+    )
+    parser.addoption(
+        "--soak",
+        action="store_true",
+        help="Reuses one browser for every test and tracks its memory, use with pytest-repeat's --count."
+    )
+    parser.addoption(
+        "--soak-sample-every",
+        type=int,
+        default=DEFAULT_SOAK_SAMPLE_EVERY,
+        help="Iterations of a test between memory samples when --soak is specified."
+    )
+    parser.addoption(
+        "--soak-max-heap-growth-mb",
+        type=float,
+        default=memory.DEFAULT_MAX_GROWTH['heap_mb'],
+        help="JS heap growth (MB) over the soak that flags a test as leaking when --soak is specified."
+    )
+    parser.addoption(
+        "--soak-output",
+        default=DEFAULT_SOAK_OUTPUT,
+        help="CSV file the memory time series is written to when --soak is specified."
+    )
+    parser.addoption(
+        "--accelerate",
+        action="store_true",
+        help="Removes CSS transitions & animations from every page and reports the time saved per test."
+    )
+    parser.addoption(
+        "--accelerate-timers",
+        type=float,
+        default=1,
+        help="Divides page setTimeout/setInterval delays by this factor when --accelerate is specified. "
+             "1 (default) leaves timers alone, pages that depend on real timing may break above it."
+    )
+    parser.addoption(
+        "--accelerate-baseline",
+        action="store_true",
+        help="Records test durations without acceleration, the baseline --accelerate reports time saved against."
+    )
+    parser.addoption(
+        "--selector-health",
+        action="store_true",
+        help="Checks every selector registered for a page when it loads, waits on missing ones fail straight away."
+    )
+    parser.addoption(
+        "--durations-store",
+        default=DEFAULT_DURATIONS_STORE,
+        help="JSON file test durations are kept in for --accelerate and --accelerate-baseline."
+    )
+
+
+def pytest_configure(config):
+    """
+    Starts collecting performance data when --web-vitals is specified, tracking memory when --soak is specified,
+    accelerating pages when --accelerate is specified and checking selectors when --selector-health is specified
+
+    :param config: pytest config
+    """
+    config.addinivalue_line('markers', 'mutates_page_state: test changes the page states it used, '
+                                       'they are rebuilt for later tests (see tests/conftest.py)')
+    if config.getoption('--web-vitals'):
+        config._perf_store = perf.start_collecting(perf.PerfStore(config.getoption('--web-vitals-store')))
+    if config.getoption('--soak'):
+        config._soak = memory.SoakMonitor(sample_every=config.getoption('--soak-sample-every'),
+                                          max_growth={'heap_mb': config.getoption('--soak-max-heap-growth-mb')})
+        config._soak_driver = None
+    if config.getoption('--selector-health'):
+        selector_health.enable()
+    if config.getoption('--accelerate') and config.getoption('--accelerate-baseline'):
+        raise pytest.UsageError('--accelerate and --accelerate-baseline record different durations, pass only one')
+    if config.getoption('--accelerate'):
+        accelerate.start(timer_factor=config.getoption('--accelerate-timers'))
+    if config.getoption('--accelerate') or config.getoption('--accelerate-baseline'):
+        config._durations = accelerate.DurationStore(config.getoption('--durations-store'))
+        config._durations_run = []
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """
+    Records how long each passing test took, fixture setup (where page loads & state building happen) included,
+    when --accelerate or --accelerate-baseline is specified
+
+    :param item: pytest test item
+    :param call: pytest call info
+    """
+    report = (yield).get_result()
+    config = item.config
+    durations = getattr(config, '_durations', None)
+    if durations is None or not report.passed:
+        return
+    if report.when == 'setup':
+        item._setup_duration = report.duration
+    elif report.when == 'call':
+        durations.record(report.nodeid, getattr(item, '_setup_duration', 0.0) + report.duration,
+                         accelerated=config.getoption('--accelerate'))
+        config._durations_run.append(report.nodeid)
+
+
+def pytest_collection(session):
+    """
+    Starts launching browsers while tests are being collected when --warm-start is specified
+
+    :param session: pytest session
+    """
+    config = session.config
+    if not config.getoption('--warm-start') or config.getoption('driver') != 'Chrome':
+        return
+
+    factory = chrome_factory(headless=config.getoption('--headless'), driver_path=config.getoption('driver_path'))
+    config._driver_pool = DriverPool(factory,
+                                     size=config.getoption('--warm-pool-size'),
+                                     prepare_template=True)
+    config._driver_pool.start()
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """
+    Fails the run when --soak is specified and a test's memory grew past its threshold
+
+    :param session: pytest session
+    :param exitstatus: int, status pytest would exit with
+    """
+    soak = getattr(session.config, '_soak', None)
+    if not soak:
+        return
+    soak.write_csv(session.config.getoption('--soak-output'))
+    if soak.flagged() and exitstatus == pytest.ExitCode.OK:
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_unconfigure(config):
+    """
+    Quits any browsers left in the warm start pool or shared by the soak
+
+    :param config: pytest config
+    """
+    soak_driver = getattr(config, '_soak_driver', None)
+    pool = getattr(config, '_driver_pool', None)
+    if soak_driver:
+        if pool:
+            pool.release(soak_driver)
+        else:
+            soak_driver.quit()
+    if pool:
+        pool.close()
+
+    perf_store = getattr(config, '_perf_store', None)
+    if perf_store:
+        perf_store.save()
+        perf.stop_collecting()
+
+    durations = getattr(config, '_durations', None)
+    if durations:
+        durations.save()
+        accelerate.stop()
+    selector_health.disable()
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """
+    Reports cold vs warm browser start up times when --warm-start is specified,
+    the performance of each page visited when --web-vitals is specified and
+    memory growth per test when --soak is specified, the time saved per test when --accelerate is specified
+    and how often cached page states were reused
+
+    :param terminalreporter: pytest terminal reporter
+    :param config: pytest config
+    """
+    perf_store = getattr(config, '_perf_store', None)
+    if perf_store:
+        _report_web_vitals(terminalreporter, perf_store.summary())
+    soak = getattr(config, '_soak', None)
+    if soak:
+        _report_soak(terminalreporter, soak, config.getoption('--soak-output'))
+    if config.getoption('--accelerate'):
+        _report_acceleration(terminalreporter, config._durations.savings(config._durations_run))
+    page_states = getattr(config, '_page_states', None)
+    if page_states and page_states.hits + page_states.misses:
+        terminalreporter.write_sep('-', 'page states')
+        terminalreporter.write_line("{} restored from cache, {} built".format(page_states.hits, page_states.misses))
+
+    pool = getattr(config, '_driver_pool', None)
+    if not pool:
+        return
+    summary = pool.summary()
+    terminalreporter.write_sep('-', 'browser start up')
+    terminalreporter.write_line("profile template built in {:.2f}s".format(summary['profile_template_time']))
+    terminalreporter.write_line("cold start: {:.2f}s avg over {} browsers launched".format(
+        summary['cold_start_avg'], summary['browsers_launched']))
+    terminalreporter.write_line("warm start: {:.2f}s avg over {} browsers used".format(
+        summary['warm_start_avg'], summary['browsers_used']))
+
+
+def _report_acceleration(terminalreporter, savings):
+    terminalreporter.write_sep('-', 'acceleration (vs --accelerate-baseline durations)')
+    if not savings:
+        terminalreporter.write_line("no baseline durations for these tests, record them with --accelerate-baseline")
+        return
+    for test, baseline, accelerated, saved in savings:
+        terminalreporter.write_line("{}: {:.2f}s -> {:.2f}s, saved {:.2f}s ({:.0%})".format(
+            test, baseline, accelerated, saved, saved / baseline if baseline else 0))
+    terminalreporter.write_line("total saved: {:.2f}s".format(sum(row[3] for row in savings)))
+
+
+def _report_web_vitals(terminalreporter, summary):
+    terminalreporter.write_sep('-', 'web vitals (p50 / p95 across runs)')
+    for page_url, metrics in sorted(summary.items()):
+        terminalreporter.write_line("{} ({} samples)".format(page_url, metrics['samples']))
+        for metric in perf.METRICS:
+            if metric in metrics:
+                terminalreporter.write_line("    {:<24} {:>10.2f} / {:.2f}".format(
+                    metric, metrics[metric]['p50'], metrics[metric]['p95']))
+
+
+def _report_soak(terminalreporter, soak, output_path):
+    terminalreporter.write_sep('-', 'soak memory growth (fitted over the run)')
+    trends = soak.trends()
+    for flow, iterations in sorted(soak.iterations.items()):
+        growth = ', '.join('{} {:+.2f}{}'.format(metric, trend['growth'], ' LEAK?' if trend['flagged'] else '')
+                           for metric, trend in sorted(trends.get(flow, {}).items()))
+        terminalreporter.write_line("{} x{}: {}".format(flow, iterations, growth or 'not enough samples'))
+    terminalreporter.write_line("memory time series written to {}".format(output_path))
+
+
+def _flow_name(item):
+    """
+    Name shared by every repetition of a test, i.e. its node id without pytest-repeat's parameter
+    """
+    name = item.nodeid.split('[')[0]
+    callspec = getattr(item, 'callspec', None)
+    params = [str(value) for key, value in sorted(callspec.params.items()) if key != REPEAT_PARAMETER] \
+        if callspec else []
+    return '{}[{}]'.format(name, '-'.join(params)) if params else name
 
 
 @pytest.fixture
@@ -35,12 +299,47 @@ def chrome_options(chrome_options, is_headless):
     :param is_headless: fixture defined (below)
     :return: bool
     """
-    # sets headless configuration
-    if is_headless:
-        chrome_options.add_argument('headless')
-    # sets browser resolution
-    chrome_options.add_argument("--window-size={}".format(DEFAULT_RESOLUTION))
-    return chrome_options
+    return configure_chrome_options(chrome_options, is_headless)
+
+
+@pytest.fixture
+def selenium(request):
+    """
+    Overrides pytest-selenium's fixture to hand out a pre-launched browser when --warm-start is specified,
+    or the browser shared by every test when --soak is specified. The helpers' page scripts are preloaded
+    into the browser where it supports it (see helpers.scripts)
+
+    :param request: pytest fixture
+    :return: selenium webdriver
+    """
+    soak = getattr(request.config, '_soak', None)
+    if soak:
+        driver = _soak_driver(request)
+        request.node._driver = driver
+        scripts.preload(driver)
+        accelerate.prepare(driver)
+        yield driver
+        try:
+            soak.after_iteration(driver, _flow_name(request.node))
+        except Exception as e:
+            print("Could not sample memory after {}: {}".format(request.node.nodeid, e))
+        return
+
+    pool = getattr(request.config, '_driver_pool', None)
+    if not pool:
+        driver = request.getfixturevalue('driver')
+        scripts.preload(driver)
+        accelerate.prepare(driver)
+        yield driver
+        return
+
+    driver = pool.acquire()
+    # lets pytest-selenium gather screenshots/logs for the report
+    request.node._driver = driver
+    scripts.preload(driver)
+    accelerate.prepare(driver)
+    yield driver
+    pool.release(driver)
 
 
 @pytest.fixture(scope='session')
@@ -57,3 +356,17 @@ def is_headless(pytestconfig):
         return True
     return False
 
+
+def _soak_driver(request):
+    """
+    Launches the browser shared by every test of the soak on first use
+    """
+    config = request.config
+    if config._soak_driver is None:
+        pool = getattr(config, '_driver_pool', None)
+        if pool:
+            config._soak_driver = pool.acquire()
+        else:
+            driver_class = request.getfixturevalue('driver_class')
+            config._soak_driver = driver_class(**request.getfixturevalue('driver_kwargs'))
+    return config._soak_driver
@@ -0,0 +1,64 @@
+"""
+Distributed mode entry point. Dispatches every collected test to the least loaded healthy remote node.
+
+    python -m distributed --node 10.0.0.5:4444:4 --node 10.0.0.6:4444:2 -- tests/amazon --headless
+    python -m distributed --hub http://grid.example.com:4444 -- -m smoke --capability browserName firefox
+
+Nodes are asked for chrome unless another `--capability browserName` is passed on to pytest.
+"""
+import argparse
+import sys
+from collections import Counter
+
+from distributed.runner import collect_tests, pytest_runner
+from distributed.scheduler import DEFAULT_MAX_ATTEMPTS, Node, Scheduler
+
+
+def parse_node(value):
+    """
+    :param value: str, host:port or host:port:slots
+    :return: Node
+    """
+    parts = value.split(':')
+    if len(parts) not in (2, 3):
+        raise argparse.ArgumentTypeError('Expected host:port[:slots], got `{}`'.format(value))
+    return Node(parts[0], int(parts[1]), int(parts[2]) if len(parts) == 3 else 1)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--node', type=parse_node, action='append', default=[], help='host:port[:slots]')
+    parser.add_argument('--hub', help='hub listing its nodes at <hub>/grid')
+    parser.add_argument('--max-attempts', type=int, default=DEFAULT_MAX_ATTEMPTS,
+                        help='times a test is run when its node keeps dying')
+    parser.add_argument('--test-timeout', type=float, help='seconds before a test process is killed')
+    parser.add_argument('pytest_args', nargs=argparse.REMAINDER, help='arguments passed on to pytest after --')
+    options = parser.parse_args(args)
+
+    pytest_args = options.pytest_args[1:] if options.pytest_args[:1] == ['--'] else options.pytest_args
+    if options.hub:
+        scheduler = Scheduler.from_hub(options.hub, max_attempts=options.max_attempts)
+    elif options.node:
+        scheduler = Scheduler(options.node, max_attempts=options.max_attempts)
+    else:
+        parser.error('one of --node or --hub is required')
+
+    tests = collect_tests(pytest_args)
+    print("Dispatching {} tests to {}".format(len(tests), scheduler.nodes))
+    results = scheduler.dispatch(tests, pytest_runner(pytest_args, options.test_timeout))
+
+    passed = 0
+    for result in sorted(results, key=lambda r: r.task):
+        node = result.nodes[-1] if result.nodes else None
+        outcome = 'PASSED' if result.result == 0 else 'ERROR {}'.format(result.error) if result.error else 'FAILED'
+        passed += outcome == 'PASSED'
+        print("{} {} on {} ({} attempts, {:.1f}s)".format(outcome, result.task,
+                                                          '{}:{}'.format(node.host, node.port) if node else '-',
+                                                          result.attempts, result.duration))
+    tests_per_node = Counter('{}:{}'.format(r.nodes[-1].host, r.nodes[-1].port) for r in results if r.nodes)
+    print("{} of {} passed. Tests per node: {}".format(passed, len(results), dict(tests_per_node)))
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
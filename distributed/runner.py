@@ -0,0 +1,56 @@
+"""
+Runs the suite's tests on remote WebDriver nodes, one pytest process per test, through pytest-selenium's
+Remote driver.
+"""
+import subprocess
+import sys
+
+from distributed.scheduler import NodeFailure
+
+# pytest exit code when the tests ran and some failed (anything else is an error)
+TESTS_FAILED = 1
+
+
+def collect_tests(pytest_args=()):
+    """
+    :param pytest_args: list of str, arguments selecting the tests (paths, -k, -m ...)
+    :return: list of str, pytest node ids
+    """
+    output = subprocess.run([sys.executable, '-m', 'pytest', '--collect-only', '-q'] + list(pytest_args),
+                            stdout=subprocess.PIPE, universal_newlines=True).stdout
+    return [line.strip() for line in output.splitlines() if '::' in line]
+
+
+def _has_capability(pytest_args, name):
+    pytest_args = list(pytest_args)
+    return any(arg == '--capability' and pytest_args[i + 1:i + 2] == [name] for i, arg in enumerate(pytest_args))
+
+
+def pytest_runner(pytest_args=(), timeout=None):
+    """
+    Builds a run_task function for Scheduler.dispatch that runs one test against a node
+
+    :param pytest_args: list of str, extra pytest arguments, e.g. ['--web-vitals']. Tests ask the nodes for chrome
+                        unless these pass another `--capability browserName`
+    :param timeout: float, seconds before a test process is killed. Optional
+    :return: function, takes (node id, Node) and returns the pytest exit code
+    """
+    def run_test(test_id, node):
+        command = [sys.executable, '-m', 'pytest', test_id, '-q', '--driver', 'Remote',
+                   '--selenium-host', node.host, '--selenium-port', str(node.port)]
+        if not _has_capability(pytest_args, 'browserName'):
+            # a Remote driver has no browser by default, this suite's options are chrome options
+            command += ['--capability', 'browserName', 'chrome']
+        command += list(pytest_args)
+        try:
+            exit_code = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                       timeout=timeout).returncode
+        except subprocess.TimeoutExpired:
+            exit_code = None
+
+        # a failed test on a node that stopped answering is the node's fault, not the test's
+        if exit_code != 0 and not node.check_health():
+            raise NodeFailure('Node {}:{} stopped responding while running {}'.format(node.host, node.port, test_id))
+        return exit_code
+
+    return run_test
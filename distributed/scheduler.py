@@ -0,0 +1,253 @@
+"""
+Capacity-aware scheduling of tests over a pool of remote WebDriver nodes
+"""
+import json
+import threading
+import time
+from collections import deque
+from urllib.error import URLError
+from urllib.request import urlopen
+
+# health check round trips kept per node to judge its recent latency
+LATENCY_SAMPLES = 10
+DEFAULT_HEALTH_INTERVAL = 5
+DEFAULT_MAX_ATTEMPTS = 3
+
+
+class NodeFailure(Exception):
+    """
+    Raised by a task runner when the node (not the test) failed, so the task is requeued on another node
+    """
+
+
+class Node(object):
+    """
+    A remote WebDriver endpoint with a number of slots (concurrent sessions) it can run
+    """
+
+    def __init__(self, host, port, slots=1):
+        """
+        :param host: str, host the node listens on
+        :param port: int, port the node listens on
+        :param slots: int, number of sessions the node can run at once
+        """
+        if slots < 1:
+            raise ValueError('A node needs at least one slot')
+        self.host = host
+        self.port = int(port)
+        self.slots = slots
+        self.busy = 0
+        self.healthy = True
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+
+    def __repr__(self):
+        return '<Node {}:{} {}/{} busy{}>'.format(self.host, self.port, self.busy, self.slots,
+                                                  '' if self.healthy else ' DEAD')
+
+    @property
+    def url(self):
+        return 'http://{}:{}/wd/hub'.format(self.host, self.port)
+
+    @property
+    def free_slots(self):
+        return self.slots - self.busy
+
+    @property
+    def load(self):
+        return self.busy / float(self.slots)
+
+    @property
+    def recent_latency(self):
+        return sum(self.latencies) / len(self.latencies) if self.latencies else 0.0
+
+    def check_health(self, timeout=5):
+        """
+        Asks the node for its status, recording the round trip as its latency
+
+        :param timeout: float, seconds to wait for the node to answer
+        :return: Boolean, True if the node answered that it is ready
+        """
+        started = time.monotonic()
+        try:
+            with urlopen(self.url + '/status', timeout=timeout) as response:
+                status = json.loads(response.read().decode() or '{}')
+        except (URLError, OSError, ValueError):
+            self.healthy = False
+            return False
+        self.latencies.append(time.monotonic() - started)
+        self.healthy = status.get('value', {}).get('ready', True) is not False
+        return self.healthy
+
+
+class TaskResult(object):
+    """
+    Outcome of a dispatched task
+    """
+
+    def __init__(self, task, result=None, error=None, nodes=(), duration=0.0):
+        self.task = task
+        self.result = result
+        self.error = error
+        # every node the task was run on, the last one is where it finished
+        self.nodes = list(nodes)
+        self.duration = duration
+
+    @property
+    def attempts(self):
+        return len(self.nodes)
+
+
+class Scheduler(object):
+    """
+    Tracks each node's free slots, health and recent latency and hands work to the least loaded healthy node.
+
+        scheduler = Scheduler([Node('10.0.0.5', 4444, slots=4), Node('10.0.0.6', 4444, slots=2)])
+        results = scheduler.dispatch(test_ids, run_test)
+    """
+
+    def __init__(self, nodes, max_attempts=DEFAULT_MAX_ATTEMPTS, health_interval=DEFAULT_HEALTH_INTERVAL):
+        """
+        :param nodes: list of Node
+        :param max_attempts: int, times a task is run before giving up on it when its node keeps dying
+        :param health_interval: float, seconds between health checks of every node (which also revives nodes
+                                that come back)
+        """
+        if not nodes:
+            raise ValueError('Please provide at least one node to schedule work on')
+        self.nodes = list(nodes)
+        self.max_attempts = max_attempts
+        self.health_interval = health_interval
+        self._condition = threading.Condition()
+
+    @classmethod
+    def from_hub(cls, hub_url, **kwargs):
+        """
+        Builds a scheduler for the nodes a hub lists at `<hub_url>/grid`, see distributed.standin_hub
+
+        :param hub_url: str, e.g. http://localhost:4444
+        :return: Scheduler
+        """
+        with urlopen(hub_url.rstrip('/') + '/grid', timeout=10) as response:
+            grid = json.loads(response.read().decode())
+        return cls([Node(node['host'], node['port'], node['slots']) for node in grid['nodes']], **kwargs)
+
+    def acquire(self):
+        """
+        Takes a slot on the least loaded healthy node (ties go to the node with the lowest recent latency),
+        waiting for a slot to free up if all are busy.
+
+        :return: Node
+        """
+        with self._condition:
+            while True:
+                healthy = [node for node in self.nodes if node.healthy]
+                if not healthy:
+                    raise NodeFailure('No healthy nodes left: {}'.format(self.nodes))
+                free = [node for node in healthy if node.free_slots > 0]
+                if free:
+                    node = min(free, key=lambda n: (n.load, n.recent_latency))
+                    node.busy += 1
+                    return node
+                self._condition.wait()
+
+    def release(self, node):
+        """
+        Gives back a slot taken with acquire
+
+        :param node: Node
+        :return: None
+        """
+        with self._condition:
+            node.busy -= 1
+            self._condition.notify_all()
+
+    def mark_dead(self, node):
+        """
+        Stops scheduling work on a node until a health check finds it ready again
+
+        :param node: Node
+        :return: None
+        """
+        with self._condition:
+            node.healthy = False
+            self._condition.notify_all()
+
+    def check_health(self):
+        """
+        Checks every node, reviving nodes that answer again
+
+        :return: None
+        """
+        for node in self.nodes:
+            healthy = node.check_health()
+            with self._condition:
+                node.healthy = healthy
+                self._condition.notify_all()
+
+    def dispatch(self, tasks, run_task):
+        """
+        Runs every task on the nodes, as many at once as there are free slots. When run_task raises
+        NodeFailure the node is marked dead and the task is requeued on another node.
+
+        :param tasks: iterable of tasks (e.g. pytest node ids)
+        :param run_task: function, takes (task, node) and returns the task's result
+        :return: list of TaskResult, in the order tasks finished
+        """
+        pending = deque((task, []) for task in tasks)
+        results = []
+        in_flight = [0]
+        stop_monitor = threading.Event()
+        monitor = threading.Thread(target=self._monitor, args=(stop_monitor,), daemon=True)
+        monitor.start()
+
+        def run(task, node, nodes_tried):
+            started = time.monotonic()
+            result = TaskResult(task, nodes=nodes_tried + [node])
+            requeue = False
+            try:
+                result.result = run_task(task, node)
+            except NodeFailure as e:
+                self.mark_dead(node)
+                result.error = e
+                requeue = result.attempts < self.max_attempts
+            except Exception as e:
+                result.error = e
+            result.duration = time.monotonic() - started
+
+            self.release(node)
+            with self._condition:
+                if requeue:
+                    pending.appendleft((task, result.nodes))
+                else:
+                    results.append(result)
+                in_flight[0] -= 1
+                self._condition.notify_all()
+
+        try:
+            while True:
+                with self._condition:
+                    while not pending and in_flight[0]:
+                        self._condition.wait()
+                    if not pending:
+                        break
+                try:
+                    node = self.acquire()
+                except NodeFailure as e:
+                    # every node is dead, fail what is left
+                    with self._condition:
+                        results.extend(TaskResult(task, error=e, nodes=tried) for task, tried in pending)
+                        pending.clear()
+                    continue
+
+                with self._condition:
+                    task, nodes_tried = pending.popleft()
+                    in_flight[0] += 1
+                threading.Thread(target=run, args=(task, node, nodes_tried), daemon=True).start()
+        finally:
+            stop_monitor.set()
+
+        return results
+
+    def _monitor(self, stop):
+        while not stop.wait(self.health_interval):
+            self.check_health()
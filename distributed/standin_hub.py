@@ -0,0 +1,168 @@
+"""
+A local stand-in hub with simulated nodes, so distributed runs and the scheduler can be tried on one machine.
+
+Every simulated node is an HTTP server answering WebDriver's `/wd/hub/status` and a `/wd/hub/run?seconds=N`
+endpoint that simulates running a test. Killing a node closes its server and drops the tests it is running
+without an answer, just like a machine dropping out.
+The hub lists its nodes at `/grid`, see Scheduler.from_hub.
+
+The nodes do not speak the rest of WebDriver, so no browser session can be started on them: they exercise the
+Scheduler (capacity, health checks, requeuing) offline, but not `python -m distributed` or pytest_runner, which
+need real WebDriver nodes (e.g. a Selenium Grid).
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+class _JsonHandler(BaseHTTPRequestHandler):
+
+    def log_message(self, format, *args):
+        # keep test output clean
+        pass
+
+    def _json(self, payload, status=200):
+        content = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class _NodeHandler(_JsonHandler):
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        node = self.server.node
+        if parsed.path.endswith('/status'):
+            self._json({'value': {'ready': node.ready, 'message': 'stand-in node'}})
+        elif parsed.path.endswith('/run'):
+            seconds = float(parse_qs(parsed.query).get('seconds', ['0'])[0])
+            with node.lock:
+                node.running += 1
+                node.max_running = max(node.max_running, node.running)
+            try:
+                killed = node.killed.wait(seconds)
+            finally:
+                with node.lock:
+                    node.running -= 1
+                    if killed:
+                        node.dropped += 1
+                    else:
+                        node.completed += 1
+            if killed:
+                # the connection is closed without an answer
+                self.close_connection = True
+                return
+            self._json({'value': 'done'})
+        else:
+            self._json({'value': {'error': 'unknown command'}}, status=404)
+
+
+class _HubHandler(_JsonHandler):
+
+    def do_GET(self):
+        if urlparse(self.path).path == '/grid':
+            self._json({'nodes': [{'host': node.host, 'port': node.port, 'slots': node.slots}
+                                  for node in self.server.hub.nodes]})
+        else:
+            self._json({'value': {'error': 'unknown command'}}, status=404)
+
+
+class _Server(object):
+
+    def __init__(self, handler, host, port):
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self._running = False
+
+    @property
+    def host(self):
+        return self._server.server_address[0]
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        self._running = True
+        return self
+
+    def stop(self):
+        if self._running:
+            self._running = False
+            self._server.shutdown()
+            self._server.server_close()
+
+
+class StandInNode(_Server):
+    """
+    A simulated WebDriver node
+    """
+
+    def __init__(self, slots=1, host='127.0.0.1', port=0):
+        """
+        :param slots: int, sessions the node advertises
+        :param host: str, interface to listen on
+        :param port: int, port to listen on. Default picks a free port
+        """
+        super(StandInNode, self).__init__(_NodeHandler, host, port)
+        self._server.node = self
+        self.slots = slots
+        self.ready = True
+        self.killed = threading.Event()
+        self.lock = threading.Lock()
+        # simulated tests running now, the most that ran at once, how many finished and how many were dropped
+        self.running = 0
+        self.max_running = 0
+        self.completed = 0
+        self.dropped = 0
+
+    def kill(self):
+        """
+        Drops the node: the tests it is running get no answer and every later request to it is refused
+        """
+        self.killed.set()
+        self.stop()
+
+
+class StandInHub(_Server):
+    """
+    A hub listing simulated nodes
+
+        with StandInHub(node_slots=(2, 1, 1)) as hub:
+            scheduler = Scheduler.from_hub(hub.url)
+    """
+
+    def __init__(self, node_slots=(1,), host='127.0.0.1', port=0):
+        """
+        :param node_slots: iterable of int, one simulated node is started per entry with that many slots
+        :param host: str, interface to listen on
+        :param port: int, port to listen on. Default picks a free port
+        """
+        super(StandInHub, self).__init__(_HubHandler, host, port)
+        self._server.hub = self
+        self.nodes = [StandInNode(slots, host) for slots in node_slots]
+
+    @property
+    def url(self):
+        return 'http://{}:{}'.format(self.host, self.port)
+
+    def start(self):
+        for node in self.nodes:
+            node.start()
+        return super(StandInHub, self).start()
+
+    def stop(self):
+        for node in self.nodes:
+            node.stop()
+        super(StandInHub, self).stop()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
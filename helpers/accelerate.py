@@ -0,0 +1,169 @@
+"""
+Acceleration mode: makes pages reach stable UI states sooner by removing CSS transitions & animations and,
+optionally, shortening page timers (carousels, setTimeout driven UI). Enabled with --accelerate.
+
+Test durations are stored per test so accelerated runs can be compared against runs without it.
+"""
+import json
+import os
+import threading
+
+from helpers import scripts
+
+# zeroes every transition & animation so elements reach their final state on the next frame
+STYLESHEET = """
+*, *::before, *::after {
+  transition-duration: 0s !important;
+  transition-delay: 0s !important;
+  animation-duration: 0s !important;
+  animation-delay: 0s !important;
+  scroll-behavior: auto !important;
+}
+"""
+
+# playback rate of Web Animations (element.animate) set through DevTools, which the stylesheet does not reach
+ANIMATION_PLAYBACK_RATE = 100
+
+# Adds the stylesheet (once the document has an element to add it to) and, when timer_factor > 1, divides the
+# delay of every setTimeout/setInterval by it. Does nothing in a document it already ran in.
+ACCELERATE = scripts.register('accelerate', """
+function(css, timerFactor) {
+  if (window.__seleniumAccelerated) { return false; }
+  window.__seleniumAccelerated = true;
+
+  function addStyle() {
+    var style = document.createElement('style');
+    style.setAttribute('data-selenium-accelerate', '');
+    style.textContent = css;
+    (document.head || document.documentElement).appendChild(style);
+  }
+  if (document.documentElement) {
+    addStyle();
+  } else {
+    document.addEventListener('DOMContentLoaded', addStyle);
+  }
+
+  if (timerFactor > 1) {
+    ['setTimeout', 'setInterval'].forEach(function(name) {
+      var original = window[name];
+      window[name] = function(callback, delay) {
+        var args = Array.prototype.slice.call(arguments);
+        args[1] = (delay || 0) / timerFactor;
+        return original.apply(window, args);
+      };
+    });
+  }
+  return true;
+}
+""")
+
+_settings = None
+
+
+def start(timer_factor=1):
+    """
+    Makes prepare() and apply() accelerate browsers & pages
+
+    :param timer_factor: float, page timer delays are divided by it. 1 leaves timers alone
+    :return: None
+    """
+    global _settings
+    _settings = {'timer_factor': timer_factor}
+
+
+def stop():
+    global _settings
+    _settings = None
+
+
+def prepare(driver):
+    """
+    Accelerates every document the browser loads from now on, through DevTools (Chrome only).
+    Other browsers are accelerated page by page by apply(). Does nothing unless start was called.
+
+    :param driver: selenium webdriver
+    :return: Boolean, True if the browser accelerates new documents by itself
+    """
+    settings = _settings
+    if settings is None or not hasattr(driver, 'execute_cdp_cmd'):
+        return False
+    if getattr(driver, '_accelerated', False):
+        return True
+    source = '({})({}, {});'.format(scripts.source(ACCELERATE), json.dumps(STYLESHEET), settings['timer_factor'])
+    try:
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': source})
+        driver.execute_cdp_cmd('Animation.setPlaybackRate', {'playbackRate': ANIMATION_PLAYBACK_RATE})
+    except Exception:
+        # e.g. a browser without DevTools behind the driver, apply() still works
+        return False
+    driver._accelerated = True
+    return True
+
+
+def apply(driver):
+    """
+    Accelerates the current page, unless prepare() already made the browser do it.
+    Does nothing unless start was called.
+
+    :param driver: selenium webdriver
+    :return: None
+    """
+    settings = _settings
+    if settings is None or getattr(driver, '_accelerated', False):
+        return
+    try:
+        scripts.call(driver, ACCELERATE, STYLESHEET, settings['timer_factor'])
+    except Exception as e:
+        # acceleration is best effort, it must never fail a functional test
+        print("Could not accelerate {}: {}".format(getattr(driver, 'current_url', 'page'), e))
+
+
+class DurationStore(object):
+    """
+    Latest duration of every test with and without acceleration, persisted as a JSON file
+    """
+
+    def __init__(self, path):
+        """
+        :param path: str, JSON file the durations are loaded from and saved to
+        """
+        self.path = path
+        self.durations = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path) as f:
+                self.durations = json.load(f)
+
+    def record(self, test, duration, accelerated):
+        """
+        :param test: str, pytest node id
+        :param duration: float, seconds the test took
+        :param accelerated: Boolean, whether the test ran in acceleration mode
+        :return: None
+        """
+        with self._lock:
+            self.durations.setdefault(test, {})['accelerated' if accelerated else 'baseline'] = duration
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock, open(self.path, 'w') as f:
+            json.dump(self.durations, f, indent=1, sort_keys=True)
+
+    def savings(self, tests=None):
+        """
+        Time saved by acceleration for every test with both durations
+
+        :param tests: iterable of str, only report these tests. Optional
+        :return: list of (test, baseline seconds, accelerated seconds, seconds saved)
+        """
+        with self._lock:
+            rows = []
+            for test, durations in sorted(self.durations.items()):
+                if tests is not None and test not in tests:
+                    continue
+                if 'baseline' in durations and 'accelerated' in durations:
+                    rows.append((test, durations['baseline'], durations['accelerated'],
+                                 durations['baseline'] - durations['accelerated']))
+            return rows
@@ -2,16 +2,19 @@
 Amazon specific helpers
 """
 from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.common.by import By
 
 from app_data.general.general import ENTER_KEY
 from app_data.selectors.amazon import INPUT_FIELD, INPUT_SEARCH_BUTTON, UPPER_RESULT_INFO, RESULTS_CONTAINER, \
     ADD_TO_CART_BUTTON, PRODUCT_TITLE, VIEW_CART_BUTTON, CART_PRODUCT_TITLE
-from helpers import dom, wait
-from helpers.dom import WebException
+from helpers import dom, perf, wait
+from helpers.dom import ElementCriteriaCondition, WebException
+from helpers.timing import timed
 
 """
 Test workflow/actions section
 """
+@timed()
 def do_search(driver, text, enter_to_search=True):
     """
     Enters in a term and then searches by either pressing the enter key or clicking the search button.
@@ -32,7 +35,9 @@ def do_search(driver, text, enter_to_search=True):
 
     # wait until search results have loaded
     wait.until_visible(driver, UPPER_RESULT_INFO)
+    perf.collect(driver, 'amazon.do_search')
 
+@timed()
 def add_to_cart(driver):
     """
     Clicks the "Add to Cart" button on a product page
@@ -40,11 +45,12 @@ def add_to_cart(driver):
     :param driver: selenium webdriver
     :return: None
     """
-    wait.until_visible(driver, PRODUCT_TITLE)
-    wait.until_visible(driver, ADD_TO_CART_BUTTON)
+    dom.wait_all(driver, [PRODUCT_TITLE, ADD_TO_CART_BUTTON])
+    perf.collect(driver, 'amazon.add_to_cart')
     dom.click_element(driver, ADD_TO_CART_BUTTON)
 
 
+@timed()
 def go_to_cart(driver):
     """
     Clicks any visible button that will navigate to the show the cart list page
@@ -67,6 +73,7 @@ def go_to_cart(driver):
 """
 Verification section
 """
+@timed()
 def verify_items_in_cart(driver, *expected_names):
     """
     Verifies the provided product names are listed in the cart.
@@ -80,6 +87,7 @@ def verify_items_in_cart(driver, *expected_names):
     assert not missing_items, "The following items are missing from the cart:\n{}".format(missing_items)
 
 
+@timed()
 def verify_search_result_summary(driver, low, high, expected_search_term):
     """
     Verifies the search summary shown at the top after search results load
@@ -92,11 +100,14 @@ def verify_search_result_summary(driver, low, high, expected_search_term):
     expected_suffix = ' results for "{}"'.format(expected_suffix)
 
     """
-    # wait until results are visible before getting text
-    wait.until_visible(driver, RESULTS_CONTAINER)
+    # wait until results and their summary are visible before getting text
+    summaries = dom.wait_all(driver, {
+        'results': RESULTS_CONTAINER,
+        'summary': ElementCriteriaCondition((By.CSS_SELECTOR, UPPER_RESULT_INFO), return_all_matching=True)
+    })['summary']
 
     # will look something like ['1-48 of over 30,000 results for ', 'gardening tools', '']
-    actual_results_summary = dom.get_elements(driver, UPPER_RESULT_INFO)[0].text.split('"')
+    actual_results_summary = summaries[0].text.split('"')
     actual_search_term = actual_results_summary[1]
     assert expected_search_term == actual_search_term, \
         "Expected search term `{}`, but got `{}` in search results summary:\n{}".format(expected_search_term,
@@ -5,11 +5,22 @@ from selenium.common.exceptions import StaleElementReferenceException, WebDriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.wait import WebDriverWait
 
+from helpers import scripts, selector_health
 # set timeout
 from helpers.exceptions import WebException
 
 DEFAULT_TIMEOUT = 60
 
+# finds the elements for several CSS selectors in one round trip, see wait_all/wait_any/wait_first
+FIND_ALL_SCRIPT = """
+function(selectors) {
+  return selectors.map(function(selector) {
+    return Array.prototype.slice.call(document.querySelectorAll(selector));
+  });
+}
+"""
+FIND_ALL = scripts.register('findAll', FIND_ALL_SCRIPT)
+
 
 def get_element(driver,
                 selector,
@@ -39,6 +50,8 @@ def get_element(driver,
         must_be_visible=must_be_visible,
         require_single_matching_element=require_single_matching_element,
         action_callback=action_callback)
+    if selector_type == By.CSS_SELECTOR:
+        callback = selector_health.FailFast(callback, selector)
     message = 'No element matching {} `{}` was found'.format(selector_type,
                                                              selector)
     if text:
@@ -72,6 +85,8 @@ def get_elements(driver,
         text,
         must_be_visible=must_be_visible,
         return_all_matching=True)
+    if selector_type == By.CSS_SELECTOR:
+        callback = selector_health.FailFast(callback, selector)
     message = "Expected at least one element matching {} `{}` to become " \
               "visible".format(selector_type, selector)
     if text:
@@ -91,6 +106,52 @@ def wait_until(driver, callback, message='', timeout=DEFAULT_TIMEOUT):
     return WebDriverWait(driver, timeout).until(callback, message)
 
 
+def wait_all(driver, conditions, timeout=DEFAULT_TIMEOUT):
+    """
+    Pauses execution until every condition has been met. All pending conditions are evaluated in the same
+    poll (CSS lookups are batched into one script call) instead of waiting for each in turn.
+
+    :param driver: webdriver
+    :param conditions: list of CSS selectors, (selector_type, selector) locators or conditions
+                       (e.g. ElementCriteriaCondition); or a dict of name -> any of those
+    :param timeout: int, time to wait before raising exception
+    :return: dict, each condition's name (or the condition itself if a list was given) -> its result
+    """
+    return _wait_for_conditions(driver, _MultiCondition(conditions, _MultiCondition.ALL), timeout)
+
+
+def wait_any(driver, conditions, timeout=DEFAULT_TIMEOUT):
+    """
+    Pauses execution until at least one condition is met, evaluating every condition in each poll.
+
+    :param driver: webdriver
+    :param conditions: see wait_all
+    :param timeout: int, time to wait before raising exception
+    :return: dict, name -> result of every condition met in the poll that succeeded
+    """
+    return _wait_for_conditions(driver, _MultiCondition(conditions, _MultiCondition.ANY), timeout)
+
+
+def wait_first(driver, conditions, timeout=DEFAULT_TIMEOUT):
+    """
+    Pauses execution until one condition is met. Conditions are evaluated in order and a poll stops at
+    the first one that is met.
+
+    :param driver: webdriver
+    :param conditions: see wait_all
+    :param timeout: int, time to wait before raising exception
+    :return: dict, a single name -> result for the condition that was met
+    """
+    return _wait_for_conditions(driver, _MultiCondition(conditions, _MultiCondition.FIRST), timeout)
+
+
+def _wait_for_conditions(driver, multi_condition, timeout):
+    try:
+        return wait_until(driver, multi_condition, timeout=timeout)
+    except TimeoutException as e:
+        raise WebException(multi_condition.timeout_message()) from e
+
+
 def click_element(driver,
                   selector,
                   text='',
@@ -190,7 +251,18 @@ class ElementCriteriaCondition(object):
 
     def __call__(self, driver):
         try:
-            found_elements = driver.find_elements(*self.locator)
+            return self.match_elements(driver.find_elements(*self.locator))
+        except (StaleElementReferenceException, WebDriverException, StopIteration):
+            return False
+
+    def match_elements(self, found_elements):
+        """
+        Applies the criteria to elements already found with the locator
+
+        :param found_elements: list of elements matching the locator
+        :return: the matched element(s), or a falsy value if there are none
+        """
+        try:
             element_generator = (element for element in found_elements if self.test_element(element))
             if self.return_all_matching:
                 result = list(element_generator)
@@ -212,3 +284,100 @@ class ElementCriteriaCondition(object):
 
         except (StaleElementReferenceException, WebDriverException, StopIteration):
             return False
+
+
+class _MultiCondition(object):
+    """
+    An expectation that evaluates several conditions in each poll, see wait_all, wait_any and wait_first.
+
+    ElementCriteriaConditions with CSS locators have their elements found together with a single script
+    call per poll; any other condition is called with the driver as usual.
+    """
+    ALL = 'all'
+    ANY = 'any'
+    FIRST = 'first'
+
+    def __init__(self, conditions, mode):
+        if not conditions:
+            raise ValueError('Please provide at least one condition to wait for')
+        items = conditions.items() if isinstance(conditions, dict) else ((c, c) for c in conditions)
+        self.conditions = [(key, self._to_condition(condition)) for key, condition in items]
+        self.mode = mode
+        # conditions not met in the last poll, for the timeout message
+        self.unmet = [key for key, _ in self.conditions]
+        self.presence = selector_health.PresenceCheck()
+
+    @staticmethod
+    def _to_condition(condition):
+        if isinstance(condition, str):
+            condition = (By.CSS_SELECTOR, condition)
+        if isinstance(condition, tuple):
+            return ElementCriteriaCondition(condition, require_single_matching_element=False)
+        return condition
+
+    def __call__(self, driver):
+        # every condition is checked in every poll so, when waiting for all, they are all met at the same time
+        # and no result is an element that went stale since an earlier poll
+        found_elements = self._find_all(driver, self.conditions)
+
+        met = {}
+        self.unmet = []
+        for key, condition in self.conditions:
+            if id(condition) in found_elements:
+                result = condition.match_elements(found_elements[id(condition)])
+            else:
+                result = condition(driver)
+            if result:
+                met[key] = result
+                if self.mode == self.FIRST:
+                    break
+            else:
+                self.unmet.append(key)
+
+        if self.mode != self.ALL:
+            if not met:
+                # only doomed if every condition waits on a selector known to be missing
+                unmet_selectors = self._css_selectors(self.unmet)
+                if len(unmet_selectors) == len(self.conditions):
+                    self.presence.check(driver, unmet_selectors, all_missing=True)
+            return met or False
+        if self.unmet:
+            self.presence.check(driver, self._css_selectors(self.unmet))
+            return False
+        return met
+
+    def _css_selectors(self, keys):
+        return [condition.locator[1] for key, condition in self.conditions
+                if key in keys and isinstance(condition, ElementCriteriaCondition)
+                and condition.locator[0] == By.CSS_SELECTOR]
+
+    def timeout_message(self):
+        pending = [self._describe(key, condition) for key, condition in self.conditions if key in self.unmet]
+        return 'Expected {} of the following conditions to be met, still waiting on: {}'.format(
+            self.mode, ', '.join(pending))
+
+    @staticmethod
+    def _describe(key, condition):
+        if isinstance(key, str):
+            return '`{}`'.format(key)
+        locator = getattr(condition, 'locator', None)
+        if locator:
+            return '{} `{}`'.format(*locator)
+        return repr(key)
+
+    def _find_all(self, driver, conditions):
+        """
+        Finds the elements of every CSS ElementCriteriaCondition with one script call
+
+        :return: dict, id(condition) -> list of elements
+        """
+        batched = [condition for _, condition in conditions
+                   if isinstance(condition, ElementCriteriaCondition) and condition.locator[0] == By.CSS_SELECTOR]
+        if len(batched) < 2:
+            return {}
+        try:
+            elements = scripts.call(driver, FIND_ALL, [condition.locator[1] for condition in batched])
+        except WebDriverException:
+            # e.g. an invalid selector, fall back to finding elements one condition at a time
+            return {}
+        return {id(condition): found for condition, found in zip(batched, elements)}
@@ -0,0 +1,248 @@
+"""
+Keeps pre-launched browsers ready so tests don't pay the Chrome & chromedriver start up cost serially
+"""
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+
+from selenium import webdriver
+
+from helpers.exceptions import WebException
+
+DEFAULT_RESOLUTION = "1024, 768"
+# files chrome leaves behind in a profile while it is running, these must not be copied to a new profile
+PROFILE_LOCK_FILES = ('Singleton*', 'lockfile', '*.lock')
+
+
+def configure_chrome_options(chrome_options, headless):
+    """
+    Applies this suite's Chrome configuration to a set of options
+
+    :param chrome_options: selenium.webdriver.ChromeOptions
+    :param headless: bool, True to run the browser in headless mode
+    :return: selenium.webdriver.ChromeOptions
+    """
+    # sets headless configuration
+    if headless:
+        chrome_options.add_argument('headless')
+    # sets browser resolution
+    chrome_options.add_argument("--window-size={}".format(DEFAULT_RESOLUTION))
+    return chrome_options
+
+
+def chrome_factory(headless=True, driver_path=None):
+    """
+    Builds a driver factory for DriverPool that launches Chrome with this suite's configuration
+
+    :param headless: bool, True to run the browsers in headless mode
+    :param driver_path: str, path to chromedriver. Default is chromedriver found on the PATH
+    :return: function, takes a user-data-dir path and returns a started webdriver
+    """
+    def launch_chrome(user_data_dir):
+        chrome_options = configure_chrome_options(webdriver.ChromeOptions(), headless)
+        chrome_options.add_argument("--user-data-dir={}".format(user_data_dir))
+        if driver_path:
+            return webdriver.Chrome(executable_path=driver_path, options=chrome_options)
+        return webdriver.Chrome(options=chrome_options)
+
+    return launch_chrome
+
+
+def prepare_profile_template(driver_factory, template_dir=None):
+    """
+    Launches a browser once against an empty user-data-dir so profile creation and first-run work
+    only happen once. The resulting directory is used as the template for every pooled browser.
+
+    :param driver_factory: function, takes a user-data-dir path and returns a started webdriver
+    :param template_dir: str, directory to create the template in. Default is a new temporary directory
+    :return: str, path of the prepared profile template
+    """
+    template_dir = template_dir or tempfile.mkdtemp(prefix='chrome-profile-template-')
+    driver = driver_factory(template_dir)
+    try:
+        driver.get('about:blank')
+    finally:
+        driver.quit()
+    return template_dir
+
+
+class DriverPool(object):
+    """
+    A small queue of browsers launched in background threads ahead of demand.
+
+    Every time a browser is taken from the pool a replacement starts launching (unless replenish
+    is False), so the pool stays `size` browsers ahead of the tests using it.
+    """
+
+    def __init__(self, driver_factory, size=2, profile_template=None, prepare_template=False, replenish=True):
+        """
+        :param driver_factory: function, takes a user-data-dir path and returns a started webdriver
+        :param size: int, number of browsers kept ready
+        :param profile_template: str, user-data-dir copied for every browser launched. Optional
+        :param prepare_template: bool, build the profile template (see prepare_profile_template) before
+                                 launching the pooled browsers when no profile_template is given
+        :param replenish: bool, launch a replacement for every browser acquired. False launches `size`
+                          browsers in total, e.g. when exactly `size` browsers will be used
+        """
+        if size < 1:
+            raise ValueError('Driver pool size must be at least 1')
+
+        self.driver_factory = driver_factory
+        self.size = size
+        self.profile_template = profile_template
+        self.prepare_template = prepare_template and not profile_template
+        self.replenish = replenish
+        # time (seconds) taken to build the profile template
+        self.template_time = 0.0
+
+        # time (seconds) taken to launch each browser
+        self.cold_start_times = []
+        # time (seconds) a test waited for a browser from the pool
+        self.warm_start_times = []
+
+        self._ready = queue.Queue()
+        self._profiles = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        # the thread building the template & launching the first browsers and every launch thread, see close
+        self._threads = []
+
+    def start(self):
+        """
+        Begins launching browsers in the background until `size` are ready. Returns immediately,
+        the profile template (if any) is also built in the background.
+
+        :return: None
+        """
+        self._run_in_thread(self._start)
+
+    def acquire(self, timeout=None):
+        """
+        Takes a ready browser from the pool, waiting for one to finish launching if needed.
+        A replacement browser starts launching straight away when the pool replenishes.
+
+        :param timeout: int, seconds to wait for a browser. Default is no limit
+        :return: webdriver
+        """
+        started = time.monotonic()
+        try:
+            driver, error = self._ready.get(timeout=timeout)
+        except queue.Empty:
+            raise WebException('No browser became ready within {} seconds'.format(timeout))
+        self.warm_start_times.append(time.monotonic() - started)
+        if self.replenish:
+            self._spawn()
+
+        if error:
+            raise WebException('Browser failed to launch: {}'.format(error)) from error
+        return driver
+
+    def release(self, driver):
+        """
+        Quits a browser taken from the pool and removes its profile
+
+        :param driver: webdriver returned by acquire
+        :return: None
+        """
+        try:
+            driver.quit()
+        finally:
+            self._remove_profile(driver)
+
+    def close(self):
+        """
+        Stops launching browsers, waits for the launches under way and quits every browser never used
+
+        :return: None
+        """
+        with self._lock:
+            self._closed = True
+        # launches still running when the session ends would leave their chromedriver & chrome behind
+        for thread in list(self._threads):
+            thread.join()
+        while True:
+            try:
+                driver, _ = self._ready.get_nowait()
+            except queue.Empty:
+                break
+            if driver:
+                self.release(driver)
+        if self.prepare_template and self.profile_template:
+            shutil.rmtree(self.profile_template, ignore_errors=True)
+
+    def summary(self):
+        """
+        Average cold (launch) and warm (wait on pool) start up times
+
+        :return: dict
+        """
+        def average(times):
+            return sum(times) / len(times) if times else 0.0
+
+        return {
+            'profile_template_time': self.template_time,
+            'browsers_launched': len(self.cold_start_times),
+            'browsers_used': len(self.warm_start_times),
+            'cold_start_avg': average(self.cold_start_times),
+            'warm_start_avg': average(self.warm_start_times),
+        }
+
+    def _start(self):
+        if self.prepare_template:
+            started = time.monotonic()
+            try:
+                self.profile_template = prepare_profile_template(self.driver_factory)
+            except Exception:
+                # pooled browsers can still launch with fresh profiles
+                self.profile_template = None
+            self.template_time = time.monotonic() - started
+
+        for _ in range(self.size):
+            self._spawn()
+
+    def _spawn(self):
+        self._run_in_thread(self._launch)
+
+    def _run_in_thread(self, target):
+        with self._lock:
+            if self._closed:
+                return
+            thread = threading.Thread(target=target, daemon=True)
+            self._threads = [t for t in self._threads if t.is_alive()] + [thread]
+            thread.start()
+
+    def _launch(self):
+        started = time.monotonic()
+        profile_dir = self._new_profile()
+        try:
+            driver = self.driver_factory(profile_dir)
+        except Exception as e:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+            self._ready.put((None, e))
+            return
+
+        self.cold_start_times.append(time.monotonic() - started)
+        with self._lock:
+            self._profiles[id(driver)] = profile_dir
+            closed = self._closed
+        if closed:
+            self.release(driver)
+        else:
+            self._ready.put((driver, None))
+
+    def _new_profile(self):
+        profile_dir = tempfile.mkdtemp(prefix='chrome-profile-')
+        if self.profile_template:
+            # copytree requires the destination to not exist
+            os.rmdir(profile_dir)
+            shutil.copytree(self.profile_template, profile_dir, ignore=shutil.ignore_patterns(*PROFILE_LOCK_FILES))
+        return profile_dir
+
+    def _remove_profile(self, driver):
+        with self._lock:
+            profile_dir = self._profiles.pop(id(driver), None)
+        if profile_dir:
+            shutil.rmtree(profile_dir, ignore_errors=True)
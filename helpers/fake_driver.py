@@ -0,0 +1,488 @@
+"""
+In-process stand-in for a selenium webdriver backed by a simulated DOM tree.
+
+Lets the helpers run without a browser so their python side cost (polls, commands sent, time spent)
+can be measured on its own. Elements can appear or go stale on a schedule and every command can be
+given an artificial latency to imitate a real browser round trip.
+"""
+import re
+import time
+from collections import Counter
+
+from selenium.common.exceptions import StaleElementReferenceException, NoSuchElementException, \
+    InvalidSelectorException
+from selenium.webdriver.common.by import By
+
+from helpers import scripts
+
+# matches one simple selector inside a compound selector, e.g. `input`, `#id`, `.class` or `[attr*="value"]`
+_SIMPLE_SELECTOR = re.compile(r"""
+    (?P<tag>^[a-zA-Z][\w-]*|^\*)
+    |\#(?P<id>[\w-]+)
+    |\.(?P<cls>[\w-]+)
+    |\[\s*(?P<attr>[\w-]+)\s*
+        (?:(?P<op>[*^$~|]?=)\s*
+            (?:"(?P<dq>(?:[^"\\]|\\.)*)"
+              |'(?P<sq>(?:[^'\\]|\\.)*)'
+              |(?P<bare>[^\]\s]+)))?
+     \s*\]
+""", re.VERBOSE)
+
+_ATTRIBUTE_OPERATORS = {
+    None: lambda actual, expected: actual is not None,
+    '=': lambda actual, expected: actual == expected,
+    '*=': lambda actual, expected: actual is not None and expected in actual,
+    '^=': lambda actual, expected: actual is not None and actual.startswith(expected),
+    '$=': lambda actual, expected: actual is not None and actual.endswith(expected),
+    '~=': lambda actual, expected: actual is not None and expected in actual.split(),
+    '|=': lambda actual, expected: actual is not None and (actual == expected or actual.startswith(expected + '-')),
+}
+
+
+def _split_descendants(selector):
+    """
+    Splits a selector on the descendant combinator (whitespace) while ignoring whitespace in [] or quotes
+    """
+    parts, current, quote, depth = [], '', None, 0
+    for char in selector.strip():
+        if quote:
+            quote = None if char == quote and not current.endswith('\\') else quote
+        elif char in '"\'':
+            quote = char
+        elif char == '[':
+            depth += 1
+        elif char == ']':
+            depth -= 1
+        elif char.isspace() and depth == 0:
+            if current:
+                parts.append(current)
+            current = ''
+            continue
+        current += char
+    if current:
+        parts.append(current)
+    return parts
+
+
+def _parse_compound(compound):
+    """
+    Parses a compound selector (no combinators) into a list of (kind, name, operator, value) tests
+    """
+    tests, position = [], 0
+    while position < len(compound):
+        match = _SIMPLE_SELECTOR.match(compound, position)
+        if not match or match.end() == position:
+            raise InvalidSelectorException('Fake driver does not support the selector `{}`'.format(compound))
+        if match.group('tag'):
+            if match.group('tag') != '*':
+                tests.append(('tag', match.group('tag').lower(), None, None))
+        elif match.group('id'):
+            tests.append(('attr', 'id', '=', match.group('id')))
+        elif match.group('cls'):
+            tests.append(('attr', 'class', '~=', match.group('cls')))
+        else:
+            value = next((v for v in match.group('dq', 'sq', 'bare') if v is not None), None)
+            if value is not None:
+                value = re.sub(r'\\(.)', r'\1', value)
+            tests.append(('attr', match.group('attr'), match.group('op'), value))
+        position = match.end()
+    return tests
+
+
+def parse_css_selector(selector):
+    """
+    Parses the subset of CSS the fake driver understands: tag, #id, .class and [attribute] selectors
+    joined by the descendant combinator.
+
+    :param selector: str, CSS selector
+    :return: list of compound selectors, outermost first
+    """
+    return [_parse_compound(part) for part in _split_descendants(selector)]
+
+
+class FakeElement(object):
+    """
+    A node in the simulated DOM. Mirrors the parts of selenium's WebElement the helpers use.
+    """
+
+    def __init__(self,
+                 tag='div',
+                 text='',
+                 attributes=None,
+                 properties=None,
+                 displayed=True,
+                 rect=None,
+                 children=(),
+                 appear_after=0,
+                 stale_after=None,
+                 on_click=None,
+                 on_send_keys=None):
+        """
+        :param tag: str, tag name
+        :param text: str, text of the element itself. Children's text is appended to it
+        :param attributes: dict, html attributes such as id, class or aria-label
+        :param properties: dict, DOM properties returned by get_property (e.g. scrollTop)
+        :param displayed: bool or function taking the element, result of is_displayed
+        :param rect: dict (x, y, width, height) or function taking the element and returning one
+        :param children: iterable of FakeElement
+        :param appear_after: float, seconds after the driver's clock starts that the element is attached
+        :param stale_after: float, seconds after the driver's clock starts that the element is removed. Optional
+        :param on_click: function, called with (driver, element) when the element is clicked
+        :param on_send_keys: function, called with (driver, element, value) when keys are sent to the element
+        """
+        self.tag_name = tag.lower()
+        self._text = text
+        self.attributes = dict(attributes or {})
+        self.properties = dict(properties or {})
+        self.displayed = displayed
+        self._rect = rect or {'x': 0, 'y': 0, 'width': 100, 'height': 20}
+        self.appear_after = appear_after
+        self.stale_after = stale_after
+        self.on_click = on_click
+        self.on_send_keys = on_send_keys
+        self.removed = False
+        self.parent = None
+        self.driver = None
+        self.children = []
+        for child in children:
+            self.append(child)
+
+    def __repr__(self):
+        return '<FakeElement {}{}>'.format(self.tag_name, ''.join(
+            '[{}="{}"]'.format(name, value) for name, value in self.attributes.items()))
+
+    """
+    Simulated DOM management
+    """
+    def append(self, child):
+        """
+        Attaches a child element
+
+        :param child: FakeElement
+        :return: the child
+        """
+        child.parent = self
+        child._attach(self.driver)
+        self.children.append(child)
+        return child
+
+    def remove(self):
+        """
+        Detaches the element from the DOM, making it (and its descendants) stale
+
+        :return: None
+        """
+        for element in self.iter():
+            element.removed = True
+        if self.parent:
+            self.parent.children.remove(self)
+            self.parent = None
+
+    def iter(self):
+        """
+        Yields the element and all of its descendants in document order
+        """
+        yield self
+        for child in list(self.children):
+            yield from child.iter()
+
+    def is_present(self):
+        """
+        Is the element currently attached to the document according to its schedule?
+
+        :return: Boolean
+        """
+        if self.removed:
+            return False
+        if self.driver:
+            elapsed = self.driver.elapsed()
+            if elapsed < self.appear_after or (self.stale_after is not None and elapsed >= self.stale_after):
+                return False
+        return not self.parent or self.parent.is_present()
+
+    def matches(self, compound):
+        """
+        Does the element match a parsed compound selector (see parse_css_selector)?
+        """
+        for kind, name, operator, value in compound:
+            if kind == 'tag':
+                if self.tag_name != name:
+                    return False
+            elif not _ATTRIBUTE_OPERATORS[operator](self.attributes.get(name), value):
+                return False
+        return True
+
+    def _attach(self, driver):
+        for element in self.iter():
+            element.driver = driver
+
+    def _command(self, name):
+        if self.driver:
+            self.driver._command(name)
+        if not self.is_present():
+            raise StaleElementReferenceException('Element {} is no longer attached to the DOM'.format(self))
+
+    """
+    WebElement API
+    """
+    @property
+    def id(self):
+        return str(id(self))
+
+    @property
+    def text(self):
+        self._command('getElementText')
+        return self._all_text()
+
+    @property
+    def rect(self):
+        self._command('getElementRect')
+        return dict(self._rect(self) if callable(self._rect) else self._rect)
+
+    @property
+    def location(self):
+        rect = self.rect
+        return {'x': rect['x'], 'y': rect['y']}
+
+    @property
+    def size(self):
+        rect = self.rect
+        return {'width': rect['width'], 'height': rect['height']}
+
+    def is_displayed(self):
+        self._command('isElementDisplayed')
+        return self.displayed(self) if callable(self.displayed) else bool(self.displayed)
+
+    def get_property(self, name):
+        self._command('getElementProperty')
+        value = self.properties.get(name)
+        return value(self) if callable(value) else value
+
+    def get_attribute(self, name):
+        self._command('getElementAttribute')
+        if name in ('textContent', 'innerText'):
+            return self._all_text()
+        if name in self.properties:
+            value = self.properties[name]
+            return value(self) if callable(value) else value
+        return self.attributes.get(name)
+
+    def click(self):
+        self._command('clickElement')
+        if self.on_click:
+            self.on_click(self.driver, self)
+
+    def send_keys(self, *value):
+        self._command('sendKeysToElement')
+        text = ''.join(str(v) for v in value)
+        self.properties['value'] = (self.properties.get('value') or '') + text
+        if self.on_send_keys:
+            self.on_send_keys(self.driver, self, text)
+
+    def clear(self):
+        self._command('clearElement')
+        self.properties['value'] = ''
+
+    def find_elements(self, by=By.ID, value=None):
+        self._command('findChildElements')
+        return self.driver._find(by, value, scope=self)
+
+    def find_element(self, by=By.ID, value=None):
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException('Unable to locate element: {} `{}`'.format(by, value))
+        return elements[0]
+
+    def _all_text(self):
+        parts = [self._text] + [child._all_text() for child in self.children if child.is_present()]
+        return ' '.join(part for part in parts if part)
+
+
+class FakeDriver(object):
+    """
+    Mirrors the parts of selenium's WebDriver the helpers use, against a simulated DOM tree.
+    """
+
+    def __init__(self, document=None, pages=None, latency=0.0, clock=time.monotonic):
+        """
+        :param document: FakeElement, the root (html) element of the current page. Optional
+        :param pages: dict, url -> function returning a new document, used by get()
+        :param latency: float or dict of command name -> float, seconds each command takes
+        :param clock: function returning the current time in seconds
+        """
+        self.pages = pages or {}
+        self.latency = latency
+        self.clock = clock
+        self.current_url = 'about:blank'
+        self.session_id = None
+        self.current_window_handle = 'main'
+        self.window_handles = ['main']
+        self.cookies = {}
+        # keys of the helper scripts (see helpers.scripts) injected into the current document
+        self.injected_scripts = set()
+        # scripts run at the start of every new document, see execute_cdp_cmd
+        self.new_document_scripts = []
+        self.commands = Counter()
+        # (pattern, function) pairs, see add_script_hook
+        self.script_hooks = []
+        self.document = None
+        self.reset_clock()
+        self.set_document(document or FakeElement('html'))
+
+    """
+    Simulation controls
+    """
+    def reset_clock(self):
+        """
+        Restarts the clock that element schedules (appear_after/stale_after) are relative to
+        """
+        self._started = self.clock()
+
+    def elapsed(self):
+        """
+        :return: float, seconds since the clock was (re)started
+        """
+        return self.clock() - self._started
+
+    def set_document(self, document):
+        """
+        Replaces the current page. Every element of the previous page goes stale.
+
+        :param document: FakeElement, root of the new page
+        :return: the document
+        """
+        if self.document is not None:
+            self.document.remove()
+        document._attach(self)
+        self.document = document
+        self.injected_scripts = set()
+        for script in self.new_document_scripts:
+            self._run_script(script, ())
+        return document
+
+    def add_script_hook(self, pattern, function):
+        """
+        Registers what execute_script/execute_async_script do for scripts containing pattern.
+
+        :param pattern: str, substring of the script to react to
+        :param function: function, called with (driver, *script_arguments); its return value is returned
+        :return: None
+        """
+        self.script_hooks.append((pattern, function))
+
+    def _command(self, name):
+        self.commands[name] += 1
+        latency = self.latency.get(name, 0.0) if isinstance(self.latency, dict) else self.latency
+        if latency:
+            time.sleep(latency)
+
+    def _find(self, by, value, scope=None):
+        scope = scope or self.document
+        if by == By.CSS_SELECTOR:
+            compounds = parse_css_selector(value)
+        elif by == By.TAG_NAME:
+            compounds = [[('tag', value.lower(), None, None)]]
+        elif by == By.ID:
+            compounds = [[('attr', 'id', '=', value)]]
+        elif by == By.CLASS_NAME:
+            compounds = [[('attr', 'class', '~=', value)]]
+        else:
+            raise InvalidSelectorException('Fake driver does not support locating by {}'.format(by))
+
+        found = []
+        for element in scope.iter():
+            if element is scope or not element.is_present() or not element.matches(compounds[-1]):
+                continue
+            ancestor, remaining = element.parent, list(compounds[:-1])
+            while remaining and ancestor is not None:
+                if ancestor.matches(remaining[-1]):
+                    remaining.pop()
+                ancestor = ancestor.parent
+            if not remaining:
+                found.append(element)
+        return found
+
+    """
+    WebDriver API
+    """
+    @property
+    def title(self):
+        self._command('getTitle')
+        title = next((element for element in self._find(By.TAG_NAME, 'title')), None)
+        return title._all_text() if title else ''
+
+    def get(self, url):
+        self._command('get')
+        self.current_url = url
+        if url in self.pages:
+            self.set_document(self.pages[url]())
+            self.reset_clock()
+
+    def find_elements(self, by=By.ID, value=None):
+        self._command('findElements')
+        return self._find(by, value)
+
+    def find_element(self, by=By.ID, value=None):
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException('Unable to locate element: {} `{}`'.format(by, value))
+        return elements[0]
+
+    def execute_script(self, script, *args):
+        self._command('executeScript')
+        return self._run_script(script, args)
+
+    def execute_async_script(self, script, *args):
+        self._command('executeAsyncScript')
+        return self._run_script(script, args)
+
+    def get_cookies(self):
+        self._command('getCookies')
+        return [dict(cookie) for cookie in self.cookies.values()]
+
+    def add_cookie(self, cookie):
+        self._command('addCookie')
+        self.cookies[cookie['name']] = dict(cookie)
+
+    def delete_all_cookies(self):
+        self._command('deleteAllCookies')
+        self.cookies.clear()
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        self._command('executeCdpCommand')
+        if cmd == 'Page.addScriptToEvaluateOnNewDocument':
+            self.new_document_scripts.append(cmd_args['source'])
+        elif cmd == 'Network.setCookies':
+            for cookie in cmd_args['cookies']:
+                self.cookies[cookie['name']] = dict(cookie)
+        return {}
+
+    def quit(self):
+        self._command('quit')
+
+    def _run_script(self, script, args):
+        for element in args:
+            for argument in element if isinstance(element, list) else [element]:
+                if isinstance(argument, FakeElement) and not argument.is_present():
+                    raise StaleElementReferenceException('Element {} is no longer attached to the '
+                                                         'DOM'.format(argument))
+        if scripts.NAMESPACE in script:
+            return self._run_registered_script(script, args)
+        for pattern, function in self.script_hooks:
+            if pattern in script:
+                return function(self, *args)
+        # batched lookups, e.g. dom.FIND_ALL_SCRIPT: a list of CSS selectors -> a list of matching elements each
+        if 'querySelectorAll' in script and args and isinstance(args[0], list):
+            return [self._find(By.CSS_SELECTOR, selector) for selector in args[0]]
+        return None
+
+    def _run_registered_script(self, script, args):
+        # helpers.scripts: (re)define some of the page's helpers and/or call one by its key
+        self.injected_scripts.update(re.findall(r'window\.{} \|\| {{}}\)\["([^"]+)"\] = '.format(scripts.NAMESPACE),
+                                                script))
+        if not args:
+            return None
+        key, call_args = args
+        if key not in self.injected_scripts:
+            return {'missing': True}
+        return {'value': self._run_script(scripts.source(key.split(':')[0]), call_args)}
@@ -0,0 +1,165 @@
+"""
+Samples browser memory (JS heap, DOM nodes & event listeners) across repeated flows to catch slow leaks
+"""
+import csv
+import os
+import time
+
+from helpers import scripts
+
+# reads what the page can see about its own memory when DevTools is not available
+MEMORY_SCRIPT = """
+function() {
+  var memory = performance.memory || {};
+  return {
+    heap_used: memory.usedJSHeapSize || null,
+    dom_nodes: document.getElementsByTagName('*').length,
+    listeners: null
+  };
+}
+"""
+MEMORY = scripts.register('pageMemory', MEMORY_SCRIPT)
+# default growth, fitted over the whole soak, above which a flow is flagged
+DEFAULT_MAX_GROWTH = {
+    'heap_mb': 10.0,
+    'dom_nodes': 2000,
+    'listeners': 500,
+}
+
+
+def sample_memory(driver):
+    """
+    Reads the page's memory usage. Uses DevTools (after forcing garbage collection) when the driver
+    supports it, otherwise falls back to performance.memory which has no listener count.
+
+    :param driver: selenium webdriver
+    :return: dict, heap_mb, dom_nodes & listeners (None if unavailable)
+    """
+    if hasattr(driver, 'execute_cdp_cmd'):
+        try:
+            driver.execute_cdp_cmd('HeapProfiler.collectGarbage', {})
+            heap = driver.execute_cdp_cmd('Runtime.getHeapUsage', {})
+            counters = driver.execute_cdp_cmd('Memory.getDOMCounters', {})
+            return {
+                'heap_mb': heap['usedSize'] / 1024 / 1024,
+                'dom_nodes': counters['nodes'],
+                'listeners': counters['jsEventListeners'],
+            }
+        except Exception:
+            # not a chromium browser, or DevTools is unavailable (e.g. a remote driver)
+            pass
+
+    sample = scripts.call(driver, MEMORY)
+    heap_used = sample.get('heap_used')
+    return {
+        'heap_mb': heap_used / 1024 / 1024 if heap_used else None,
+        'dom_nodes': sample.get('dom_nodes'),
+        'listeners': sample.get('listeners'),
+    }
+
+
+def fit_trend(xs, ys):
+    """
+    Least-squares line through the points
+
+    :param xs: list of numbers
+    :param ys: list of numbers
+    :return: tuple, (slope, intercept). Slope is 0 with fewer than 2 distinct xs
+    """
+    count = len(xs)
+    if count < 2:
+        return 0.0, ys[0] if ys else 0.0
+    mean_x = sum(xs) / count
+    mean_y = sum(ys) / count
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    if not variance:
+        return 0.0, mean_y
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance
+    return slope, mean_y - slope * mean_x
+
+
+class SoakMonitor(object):
+    """
+    Counts iterations of each flow, samples memory every `sample_every` iterations and fits a growth trend
+    """
+
+    def __init__(self, sample_every=10, max_growth=None):
+        """
+        :param sample_every: int, iterations between memory samples. The first iteration is always sampled
+        :param max_growth: dict, metric -> growth over the soak that flags a flow. See DEFAULT_MAX_GROWTH
+        """
+        if sample_every < 1:
+            raise ValueError('Memory must be sampled at least every iteration')
+        self.sample_every = sample_every
+        self.max_growth = dict(DEFAULT_MAX_GROWTH, **(max_growth or {}))
+        self.iterations = {}
+        # flow -> list of samples (dicts with iteration, timestamp & metrics)
+        self.samples = {}
+
+    def after_iteration(self, driver, flow):
+        """
+        Records that the flow ran once more, sampling memory if it is due
+
+        :param driver: selenium webdriver the flow ran in
+        :param flow: str, name of the flow
+        :return: dict, the sample taken, None if none was due
+        """
+        iteration = self.iterations.get(flow, 0) + 1
+        self.iterations[flow] = iteration
+        if iteration != 1 and iteration % self.sample_every:
+            return None
+
+        sample = dict(sample_memory(driver), iteration=iteration, timestamp=time.time())
+        self.samples.setdefault(flow, []).append(sample)
+        return sample
+
+    def trends(self):
+        """
+        Fitted growth of each metric per flow
+
+        :return: dict, flow -> metric -> {'per_iteration': slope, 'growth': fitted growth over the soak,
+                 'flagged': bool}
+        """
+        trends = {}
+        for flow, samples in self.samples.items():
+            trends[flow] = {}
+            for metric, maximum in self.max_growth.items():
+                points = [(s['iteration'], s[metric]) for s in samples if s.get(metric) is not None]
+                if len(points) < 2:
+                    continue
+                xs, ys = zip(*points)
+                slope, _ = fit_trend(xs, ys)
+                growth = slope * (xs[-1] - xs[0])
+                trends[flow][metric] = {'per_iteration': slope, 'growth': growth, 'flagged': growth > maximum}
+        return trends
+
+    def flagged(self):
+        """
+        :return: dict, flow -> list of metrics that grew past their threshold
+        """
+        flagged = {}
+        for flow, metrics in self.trends().items():
+            leaking = sorted(metric for metric, trend in metrics.items() if trend['flagged'])
+            if leaking:
+                flagged[flow] = leaking
+        return flagged
+
+    def write_csv(self, path):
+        """
+        Writes every sample as a compact time series (one row per sample) for plotting
+
+        :param path: str, csv file to write
+        :return: None
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['flow', 'iteration', 'timestamp', 'heap_mb', 'dom_nodes', 'listeners'])
+            for flow, samples in sorted(self.samples.items()):
+                for s in samples:
+                    writer.writerow([flow, s['iteration'], '{:.3f}'.format(s['timestamp']),
+                                     '' if s['heap_mb'] is None else '{:.3f}'.format(s['heap_mb']),
+                                     '' if s['dom_nodes'] is None else s['dom_nodes'],
+                                     '' if s['listeners'] is None else s['listeners']])
@@ -0,0 +1,131 @@
+"""
+Caches page states (e.g. "search results for X") so tests that need the same state fork from it instead of
+redoing the navigation & actions that reached it
+"""
+import threading
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import WebDriverException
+
+from helpers import url, wait
+from helpers.exceptions import WebException
+
+# seconds a restored state gets to show its ready selector before it is rebuilt instead
+RESTORE_TIMEOUT = 10
+
+
+class PageState(object):
+    """
+    What is needed to get back to a page: its url and the cookies of the session that reached it
+    """
+
+    def __init__(self, page_url, cookies, session_id=None):
+        """
+        :param page_url: str, url of the page
+        :param cookies: list of dict, as returned by driver.get_cookies()
+        :param session_id: str, webdriver session the state was captured in. Optional
+        """
+        self.url = page_url
+        self.cookies = cookies
+        self.session_id = session_id
+
+    @classmethod
+    def capture(cls, driver):
+        """
+        :param driver: selenium webdriver showing the page
+        :return: PageState
+        """
+        return cls(driver.current_url, driver.get_cookies(), getattr(driver, 'session_id', None))
+
+    def restore(self, driver):
+        """
+        Brings the driver to the state. The browser the state was captured in (e.g. when --soak shares
+        one browser) still has its cookies and only navigates to the page. Any other browser is given the
+        state's cookies first (through DevTools, or by opening the page's origin when it has none), so the
+        page loads in the captured session.
+
+        :param driver: selenium webdriver
+        :return: None
+        """
+        if not (self.session_id and getattr(driver, 'session_id', None) == self.session_id):
+            if not self._set_cookies_with_devtools(driver):
+                parsed = urlparse(self.url)
+                # cookies can only be set for the domain the browser is on
+                driver.get('{}://{}/'.format(parsed.scheme, parsed.netloc))
+                domain = parsed.hostname or ''
+                for cookie in self.cookies:
+                    if domain.endswith(cookie.get('domain', '').lstrip('.')):
+                        driver.add_cookie(cookie)
+        url.go_to_url(driver, self.url)
+
+    def _set_cookies_with_devtools(self, driver):
+        if not hasattr(driver, 'execute_cdp_cmd'):
+            return False
+        cookies = []
+        for cookie in self.cookies:
+            cdp_cookie = {key: cookie[key] for key in ('name', 'value', 'domain', 'path', 'secure', 'httpOnly',
+                                                       'sameSite') if key in cookie}
+            if 'expiry' in cookie:
+                cdp_cookie['expires'] = cookie['expiry']
+            if 'domain' not in cdp_cookie:
+                cdp_cookie['url'] = self.url
+            cookies.append(cdp_cookie)
+        try:
+            driver.execute_cdp_cmd('Network.setCookies', {'cookies': cookies})
+        except Exception:
+            # not a chromium browser, or DevTools is unavailable (e.g. a remote driver)
+            return False
+        return True
+
+
+class PageStateCache(object):
+    """
+    Page states keyed by what reached them, e.g. (url, search term)
+    """
+
+    def __init__(self):
+        self.states = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def reach(self, driver, key, build, ready_selector):
+        """
+        Brings the driver to the state for key, restoring it from the cache if possible.
+        Otherwise (or when the restored page never becomes ready) the state is built and cached.
+
+        :param driver: selenium webdriver
+        :param key: hashable, identifies the state, e.g. (url, search term)
+        :param build: function, takes the driver and brings it to the state from scratch
+        :param ready_selector: str, CSS selector visible once the state's page is ready
+        :return: None
+        """
+        with self._lock:
+            state = self.states.get(key)
+        if state:
+            try:
+                state.restore(driver)
+                wait.until_visible(driver, ready_selector, timeout=RESTORE_TIMEOUT)
+                with self._lock:
+                    self.hits += 1
+                return
+            except (WebException, WebDriverException):
+                # e.g. the cookies were refused or the page timed out loading, the state is rebuilt instead
+                self.invalidate(key)
+
+        build(driver)
+        wait.until_visible(driver, ready_selector)
+        with self._lock:
+            self.misses += 1
+            self.states[key] = PageState.capture(driver)
+
+    def invalidate(self, *keys):
+        """
+        Forgets states, e.g. after a test changed the session they share (added items to a cart...)
+
+        :param keys: keys given to reach
+        :return: None
+        """
+        with self._lock:
+            for key in keys:
+                self.states.pop(key, None)
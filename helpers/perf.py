@@ -0,0 +1,197 @@
+"""
+Collects front-end performance data (Navigation Timing, resource timing, LCP, CLS & long tasks) for the
+pages the tests visit, aggregates it per URL in a local store and checks it against per-page thresholds.
+
+Collection is off until start_collecting is called (see --web-vitals in conftest.py), so helpers can call
+collect() after every navigation/interaction for free.
+"""
+import json
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+from helpers import scripts
+from helpers.timing import percentile
+
+# samples kept per URL in the store, oldest are dropped first
+MAX_SAMPLES_PER_URL = 200
+# metrics returned by COLLECT_SCRIPT that can be aggregated and given thresholds
+METRICS = ('ttfb_ms', 'dom_content_loaded_ms', 'load_ms', 'lcp_ms', 'cls', 'long_tasks', 'long_task_ms',
+           'resources', 'transfer_kb')
+
+# reads everything in one call. Buffered observers hand back entries recorded before the script ran.
+COLLECT_SCRIPT = """
+function(done) {
+  var entries = {'largest-contentful-paint': [], 'layout-shift': [], 'longtask': []};
+  var observers = Object.keys(entries).map(function(type) {
+    try {
+      var observer = new PerformanceObserver(function(list) {
+        entries[type] = entries[type].concat(list.getEntries());
+      });
+      observer.observe({type: type, buffered: true});
+      return observer;
+    } catch (error) {
+      return null;
+    }
+  });
+
+  setTimeout(function() {
+    observers.forEach(function(observer) {
+      if (observer) {
+        observer.takeRecords().forEach(function(entry) { entries[entry.entryType].push(entry); });
+        observer.disconnect();
+      }
+    });
+
+    var navigation = performance.getEntriesByType('navigation')[0] || {};
+    var resources = performance.getEntriesByType('resource');
+    var lcp = entries['largest-contentful-paint'];
+    var sum = function(items, key) {
+      return items.reduce(function(total, item) { return total + (item[key] || 0); }, 0);
+    };
+
+    done({
+      url: location.href,
+      ttfb_ms: navigation.responseStart || null,
+      dom_content_loaded_ms: navigation.domContentLoadedEventEnd || null,
+      load_ms: navigation.loadEventEnd || null,
+      lcp_ms: lcp.length ? lcp[lcp.length - 1].startTime : null,
+      cls: sum(entries['layout-shift'].filter(function(entry) { return !entry.hadRecentInput; }), 'value'),
+      long_tasks: entries['longtask'].length,
+      long_task_ms: sum(entries['longtask'], 'duration'),
+      resources: resources.length,
+      transfer_kb: sum(resources, 'transferSize') / 1024
+    });
+  }, 0);
+}
+"""
+COLLECT = scripts.register('collectPerformance', COLLECT_SCRIPT)
+
+# active collector, see start_collecting
+_collector = None
+
+
+class PerfStore(object):
+    """
+    Samples aggregated per URL (scheme, host & path) across runs, persisted as a JSON file
+    """
+
+    def __init__(self, path):
+        """
+        :param path: str, JSON file the samples are loaded from and saved to
+        """
+        self.path = path
+        self.samples = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path) as f:
+                self.samples = json.load(f)
+
+    def add(self, sample):
+        """
+        :param sample: dict, metrics returned by COLLECT_SCRIPT plus a label
+        :return: None
+        """
+        key = url_key(sample['url'])
+        with self._lock:
+            samples = self.samples.setdefault(key, [])
+            samples.append(sample)
+            del samples[:-MAX_SAMPLES_PER_URL]
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock, open(self.path, 'w') as f:
+            json.dump(self.samples, f, indent=1, sort_keys=True)
+
+    def summary(self):
+        """
+        Median & p95 of every metric per URL
+
+        :return: dict, url -> {'samples': int, metric: {'p50': number, 'p95': number}}
+        """
+        with self._lock:
+            summary = {}
+            for key, samples in self.samples.items():
+                summary[key] = {'samples': len(samples)}
+                for metric in METRICS:
+                    values = [sample[metric] for sample in samples if sample.get(metric) is not None]
+                    if values:
+                        summary[key][metric] = {'p50': percentile(values, 50), 'p95': percentile(values, 95)}
+            return summary
+
+
+def url_key(url):
+    """
+    :param url: str
+    :return: str, the url without query string or fragment
+    """
+    parsed = urlparse(url)
+    return '{}://{}{}'.format(parsed.scheme, parsed.netloc, parsed.path)
+
+
+def start_collecting(store):
+    """
+    Makes collect() record samples into the store
+
+    :param store: PerfStore
+    :return: the store
+    """
+    global _collector
+    _collector = store
+    return store
+
+
+def stop_collecting():
+    global _collector
+    _collector = None
+
+
+def collect(driver, label):
+    """
+    Reads the page's performance data in one script call and adds it to the active store.
+    Does nothing unless start_collecting was called.
+
+    :param driver: selenium webdriver
+    :param label: str, what led to the page state, e.g. the helper that navigated
+    :return: dict, the sample, None when not collecting
+    """
+    store = _collector
+    if store is None:
+        return None
+    try:
+        sample = scripts.call_async(driver, COLLECT)
+    except Exception as e:
+        # performance data is best effort, it must never fail a functional test
+        print("Could not collect performance data for {}: {}".format(label, e))
+        return None
+    if not sample:
+        return None
+
+    sample['label'] = label
+    sample['timestamp'] = time.time()
+    store.add(sample)
+    return sample
+
+
+def verify_thresholds(sample, thresholds):
+    """
+    Verifies each metric in the sample is at or below its threshold
+
+    :param sample: dict, returned by collect (nothing is checked if None)
+    :param thresholds: dict, metric -> maximum allowed value, e.g. {'lcp_ms': 4000, 'cls': 0.1}
+    :return: None
+    """
+    if not sample or not thresholds:
+        return
+    unknown_metrics = set(thresholds).difference(METRICS)
+    assert not unknown_metrics, "Unknown performance metrics in thresholds: {}".format(unknown_metrics)
+
+    exceeded = {
+        metric: '{} > {}'.format(sample[metric], maximum)
+        for metric, maximum in thresholds.items()
+        if sample.get(metric) is not None and sample[metric] > maximum
+    }
+    assert not exceeded, "Performance thresholds exceeded on {}:\n{}".format(sample['url'], exceeded)
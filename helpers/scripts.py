@@ -0,0 +1,194 @@
+"""
+Registry of the JavaScript helpers run in the page.
+
+Scripts are declared once by name as function expressions. The first call of a script in a document sends that
+script alone, defining it in `window.__seleniumHelpers` and calling it in the same round trip (or every script is
+preloaded into new documents through DevTools, see preload), later calls only send the script's name and arguments.
+Each script is keyed in the page by its name and a digest of its source, so registering it again sends it again.
+
+Which scripts were sent is remembered per driver until it navigates (see forget, called by url.go_to_url). A call
+of a sent script in a document that no longer has it (e.g. after clicking a link) finds no script under its key
+and is sent again along with the script, costing one extra round trip.
+
+    scripts.register('wheel', 'function(element, deltaY, deltaX) { ... }')
+    scripts.call(driver, 'wheel', element, 100, 0)
+"""
+import hashlib
+import json
+import threading
+from collections import Counter, OrderedDict
+
+NAMESPACE = '__seleniumHelpers'
+
+# calls a helper in the page by its key, answering {missing: true} when the helper is not injected.
+# Sent with every call, so kept short
+CALL_SCRIPT = ("var f = (window.{} || {{}})[arguments[0]]; "
+               "return f ? {{value: f.apply(null, arguments[1])}} : {{missing: true}};").format(NAMESPACE)
+
+# same for helpers taking a callback as their last argument, run with execute_async_script
+CALL_ASYNC_SCRIPT = ("var a = arguments, f = (window.{} || {{}})[a[0]]; if (!f) return a[2]({{missing: true}}); "
+                     "f.apply(null, a[1].concat([function(v) {{ a[2]({{value: v}}); }}]));").format(NAMESPACE)
+
+# defines one helper in the page under its key
+INSTALL_SCRIPT = '(window.{0} = window.{0} || {{}})[{1}] = {2};\n'
+
+_registry = OrderedDict()
+_lock = threading.Lock()
+# version, bundle & each script's key and install script, built from the registry when first needed
+_bundle = {}
+
+# calls made, injections (and preloads) sent and the bytes of script sent vs what sending each script inline costs
+stats = Counter()
+
+
+def register(name, source):
+    """
+    Declares a script, replacing any script registered with the same name
+
+    :param name: str, short name the script is called by
+    :param source: str, JavaScript function expression, e.g. 'function(element) { return element.scrollTop; }'.
+                   Scripts run through call_async get a callback to call with their result as last argument
+    :return: str, the name
+    """
+    with _lock:
+        _registry[name] = source
+        _bundle.clear()
+    return name
+
+
+def source(name):
+    """
+    :param name: str, name of a registered script
+    :return: str, the script's function expression
+    """
+    return _registry[name]
+
+
+def version():
+    """
+    :return: str, identifies the registered scripts. Changes when a script is (re)registered
+    """
+    return _installs()['version']
+
+
+def bundle():
+    """
+    :return: str, standalone script defining every registered script in window.__seleniumHelpers
+    """
+    return _installs()['script']
+
+
+def call(driver, name, *args):
+    """
+    Runs a registered script with execute_script, injecting it first if the page does not have it
+
+    :param driver: selenium webdriver
+    :param name: str, name of a registered script
+    :param args: arguments for the script (elements, lists and dicts are passed like execute_script's)
+    :return: what the script returned
+    """
+    return _call(driver, driver.execute_script, CALL_SCRIPT, name, args)
+
+
+def call_async(driver, name, *args):
+    """
+    Runs a registered script with execute_async_script, see call
+
+    :param driver: selenium webdriver
+    :param name: str, name of a registered script taking a callback as last argument
+    :param args: arguments for the script, the callback excluded
+    :return: what the script passed to its callback
+    """
+    return _call(driver, driver.execute_async_script, CALL_ASYNC_SCRIPT, name, args)
+
+
+def inject(driver):
+    """
+    Injects every registered script into the current document
+
+    :param driver: selenium webdriver
+    :return: None
+    """
+    installs = _installs()
+    stats['injections'] += 1
+    stats['bytes_sent'] += len(installs['script'])
+    driver.execute_script(installs['script'])
+    driver._sent_scripts = set(installs['keys'].values())
+
+
+def forget(driver):
+    """
+    Marks the driver as showing a new document (e.g. after navigating), so the next call of each script sends the
+    script along instead of first finding the page does not have it
+
+    :param driver: selenium webdriver
+    :return: None
+    """
+    driver._sent_scripts = set()
+
+
+def preload(driver):
+    """
+    Makes every document the browser loads from now on start with the registered scripts (Chrome DevTools only).
+    In other browsers, and for documents already loaded, the scripts are injected on first call instead.
+
+    :param driver: selenium webdriver
+    :return: Boolean, True if the scripts are preloaded
+    """
+    current_version = version()
+    if getattr(driver, '_preloaded_scripts', None) == current_version:
+        return True
+    if not hasattr(driver, 'execute_cdp_cmd'):
+        return False
+    try:
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': bundle()})
+    except Exception:
+        # e.g. a browser without DevTools behind the driver, injecting on first call still works
+        return False
+    driver._preloaded_scripts = current_version
+    stats['preloads'] += 1
+    stats['bytes_sent'] += len(bundle())
+    return True
+
+
+def _installs():
+    with _lock:
+        if not _bundle:
+            keys, installs = {}, {}
+            for name, script in _registry.items():
+                keys[name] = '{}:{}'.format(name, hashlib.sha1(script.encode()).hexdigest()[:8])
+                installs[name] = INSTALL_SCRIPT.format(NAMESPACE, json.dumps(keys[name]), script)
+            _bundle['version'] = hashlib.sha1(''.join(sorted(keys.values())).encode()).hexdigest()[:12]
+            _bundle['script'] = ''.join(installs.values())
+            _bundle['keys'] = keys
+            _bundle['installs'] = installs
+        return _bundle
+
+
+def _call(driver, execute, call_script, name, args):
+    installs = _installs()
+    if name not in _registry:
+        raise KeyError('No script registered as `{}`'.format(name))
+    key = installs['keys'][name]
+    args = [key, list(args)]
+    sent = getattr(driver, '_sent_scripts', None)
+    if sent is None:
+        sent = driver._sent_scripts = set()
+
+    stats['calls'] += 1
+    stats['bytes_inline'] += len(_registry[name])
+    if key in sent or getattr(driver, '_preloaded_scripts', None) == installs['version']:
+        stats['bytes_sent'] += len(call_script)
+        result = execute(call_script, *args)
+        if isinstance(result, dict) and not result.get('missing'):
+            return result.get('value')
+        # the driver is showing another document, none of the scripts sent before are in it
+        sent.clear()
+
+    # first call in this document: define the script and call it in the same round trip
+    install = installs['installs'][name]
+    stats['injections'] += 1
+    stats['bytes_sent'] += len(install) + len(call_script)
+    result = execute(install + call_script, *args)
+    sent.add(key)
+    return result.get('value') if isinstance(result, dict) else None
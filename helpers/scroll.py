@@ -1,10 +1,83 @@
+import math
+
 from selenium.common.exceptions import StaleElementReferenceException, \
     WebDriverException
 from selenium.webdriver.common.by import By
 
-from library import utils
-from library.dom import wait_until, DEFAULT_TIMEOUT
-from library.utils import request_animation_frame
+from helpers import scripts, utils
+from helpers.dom import wait_until, DEFAULT_TIMEOUT
+from helpers.exceptions import WebException
+from helpers.utils import request_animation_frame
+
+# scroll strategies for scroll_until_visible
+FIXED_STEP = 'fixed'
+JUMP = 'jump'
+
+# Scrolls an element to a position (if one is given), waits for the next
+# frame so virtualized content can render, then returns the scroll geometry
+# along the requested axis. One round trip per step.
+SCROLL_TO_SCRIPT = """
+function(element, position, horizontal, done) {
+  if (position !== null) {
+    if (horizontal) {
+      element.scrollLeft = position;
+    } else {
+      element.scrollTop = position;
+    }
+  }
+  window.requestAnimationFrame(function() {
+    done({
+      position: horizontal ? element.scrollLeft : element.scrollTop,
+      size: horizontal ? element.scrollWidth : element.scrollHeight,
+      client: horizontal ? element.clientWidth : element.clientHeight
+    });
+  });
+}
+"""
+SCROLL_TO = scripts.register('scrollTo', SCROLL_TO_SCRIPT)
+
+# Dispatches a wheel event on an element
+WHEEL = scripts.register('wheel', """
+function(element, deltaY, deltaX) {
+  var e;
+  try {
+    // Chrome, Firefox
+    e = new WheelEvent('wheel', { bubbles: true, deltaX: deltaX,
+                                  deltaY: deltaY });
+  }
+  catch(error) {
+    // Internet Explorer
+    e = document.createEvent('wheelevent');
+    e.initWheelEvent('wheel', true, true, window, 0, 0, 0, 0, 0, 0, null, '',
+                     deltaX, deltaY, 0, 0);
+  }
+  element.dispatchEvent(e);
+}
+""")
+
+# Dispatches a wheel event scrolling an element as far as it goes
+WHEEL_TO_EXTREME = scripts.register('wheelToExtreme', """
+function(element, start, horizontal) {
+  var e;
+  var deltaValue = start ? Number.MIN_SAFE_INTEGER : Number.MAX_SAFE_INTEGER;
+  try {
+    // Chrome, Firefox
+    var deltaKey = horizontal ? 'deltaX' : 'deltaY';
+    var eventPayload = { bubbles: true };
+    eventPayload[deltaKey] = deltaValue;
+    e = new WheelEvent('wheel', eventPayload);
+  }
+  catch(error) {
+    // Internet Explorer
+    var dx = horizontal ? deltaValue : 0;
+    var dy = horizontal ? 0 : deltaValue;
+    e = document.createEvent('wheelevent');
+    e.initWheelEvent('wheel', true, true, window, 0, 0, 0, 0, 0, 0, null,
+                     '', dx, dy, 0, 0);
+  }
+  element.dispatchEvent(e);
+}
+""")
 
 
 def scroll_until_visible(driver,
@@ -14,9 +87,13 @@ def scroll_until_visible(driver,
                          text='',
                          horizontal=False,
                          selector_type=By.CSS_SELECTOR,
-                         timeout=DEFAULT_TIMEOUT):
+                         timeout=DEFAULT_TIMEOUT,
+                         strategy=FIXED_STEP,
+                         item_size_px=None,
+                         target_offset_px=None,
+                         stats=None):
     """
-    This function imitates a wait_* function from library.dom. However, instead
+    This function imitates a wait_* function from helpers.dom. However, instead
     of just waiting for an element to become visible, it actively scrolls a
     given parent element, checking after each motion whether a child element
     that matches the supplied selector is visible.
@@ -25,6 +102,8 @@ def scroll_until_visible(driver,
     :param scrollable_element: the element to be scrolled
     :param selector: selector for child elements to match.
     :param delta_px: The amount that the element should be scrolled, in pixels.
+                     Required by the fixed step strategy. The jump strategy
+                     only uses it to estimate the fixed step baseline.
     :param text: text that the element should contain. Default is an empty
                  string. This is optional.
     :param horizontal: Whether we should scroll horizonally. Default is False,
@@ -32,11 +111,30 @@ def scroll_until_visible(driver,
     :param selector_type: format for the selector. Default is By.CSS_SELECTOR.
                           Optional.
     :param timeout: time to wait until a TimeoutException is raised. Optional.
-    :return:
+    :param strategy: FIXED_STEP (default) wheels the element by delta_px per
+                     attempt. JUMP uses the element's scroll geometry to jump
+                     close to the target, see _ElementJumpedIntoView.
+    :param item_size_px: JUMP only. Estimated size of one child element, used
+                         so consecutive pages overlap by one item. Optional.
+    :param target_offset_px: JUMP only. Known (or estimated) scroll offset of
+                             the target, jumped to first. Optional.
+    :param stats: dict, filled with the steps taken (and the fixed step
+                  baseline for JUMP) once the element is found. Optional.
+    :return: the WebElement once it is located and visible
     """
-    return wait_until(driver,
-                      _ElementWheeledIntoView(scrollable_element, (selector_type, selector), text, delta_px,
-                                              horizontal), timeout)
+    locator = (selector_type, selector)
+    if strategy == JUMP:
+        condition = _ElementJumpedIntoView(scrollable_element, locator, text, horizontal, item_size_px,
+                                           target_offset_px, baseline_delta_px=delta_px)
+    elif strategy == FIXED_STEP:
+        condition = _ElementWheeledIntoView(scrollable_element, locator, text, delta_px, horizontal)
+    else:
+        raise ValueError('Unknown scroll strategy `{}`'.format(strategy))
+
+    element = wait_until(driver, condition, timeout=timeout)
+    if stats is not None:
+        stats.update(condition.stats())
+    return element
 
 
 def element_is_scrolled_to_extreme(element, start=True, horizontal=False):
@@ -127,26 +225,7 @@ def wheel_element(driver, element, delta_px, horizontal=False):
     horizontal_px = delta_px if horizontal else 0
     vertical_px = delta_px if not horizontal else 0
 
-    driver.execute_script("""
-    var element = arguments[0];
-    var deltaY = arguments[1];
-    var deltaX = arguments[2];
-        
-    var e;
-    try {
-      // Chrome, Firefox
-      e = new WheelEvent('wheel', { bubbles: true, deltaX: deltaX, 
-                                    deltaY: deltaY })
-    }
-    catch(error) {
-      // Internet Explorer
-      e = document.createEvent('wheelevent');
-      e.initWheelEvent('wheel', true, true, window, 0, 0, 0, 0, 0, 0, null, '', 
-                       deltaX, deltaY, 0, 0);
-    }
-    
-    element.dispatchEvent(e);
-    """, element, vertical_px, horizontal_px)
+    scripts.call(driver, WHEEL, element, vertical_px, horizontal_px)
 
     request_animation_frame(driver)
 
@@ -209,33 +288,7 @@ def wheel_to_extreme(driver, element, start=True, horizontal=False):
                        is False, i.e. vertical scrolling.
     :return: None
     """
-    driver.execute_script("""
-        var element = arguments[0];
-        var start = arguments[1];
-        var horizontal = arguments[2];
-        
-        var e;
-        try {
-          // Chrome, Firefox
-          var deltaKey = horizontal ? 'deltaX' : 'deltaY';
-          var deltaValue = start ? Number.MIN_SAFE_INTEGER : 
-                                   Number.MAX_SAFE_INTEGER;
-          
-          var eventPayload = { bubbles: true };
-          eventPayload[deltaKey] = deltaValue;
-          e = new WheelEvent('wheel', eventPayload);
-        }
-        catch(error) {
-          // Internet Explorer
-          var dx = horizontal ? deltaValue : 0;
-          var dy = horizontal ? 0 : deltaValue;
-          e = document.createEvent('wheelevent');
-          e.initWheelEvent('wheel', true, true, window, 0, 0, 0, 0, 0, 0, null, 
-                           '', dx, dy, 0, 0);
-        }
-        
-        element.dispatchEvent(e);
-    """, element, start, horizontal)
+    scripts.call(driver, WHEEL_TO_EXTREME, element, start, horizontal)
 
 
 class _ElementWheeledIntoView(object):
@@ -266,6 +319,10 @@ class _ElementWheeledIntoView(object):
         self.delta_px = delta_px
         self.horizontal = horizontal
         self.text = text
+        self.steps = 0
+
+    def stats(self):
+        return {'steps': self.steps}
 
     def __call__(self, driver):
         try:
@@ -293,6 +350,7 @@ class _ElementWheeledIntoView(object):
             return False
 
     def _move_element(self, driver):
+        self.steps += 1
         delta_px_is_positive = self.delta_px > 0
 
         # If we have hit the end of the scroll of an element, go back to the
@@ -306,6 +364,168 @@ class _ElementWheeledIntoView(object):
             wheel_element(driver, self.parent_element, self.delta_px, self.horizontal)
 
 
+class _ElementJumpedIntoView(object):
+    """ An expectation for checking that an element has scrolled into view,
+    using the parent_element's scroll geometry instead of fixed size steps.
+
+    1. Jump: if the target's offset is known (target_offset_px) the parent is
+       scrolled straight to it.
+    2. Sweep: otherwise the parent is paged through one viewport at a time
+       (overlapping by item_size_px), wrapping to the start at the end.
+    3. Refine: once a matching element is rendered but not inside the parent,
+       the parent jumps by its measured distance so it is centered, correcting
+       with exponentially shrinking steps if it is still not inside.
+
+    If a full pass through content with matching elements rendered completes
+    without the scrollable content growing, the target will never render and a WebException is raised instead of cycling
+    until the timeout. So is one when a rendered match can never fit inside
+    the parent: it is larger than the parent, or a refine step cannot move it.
+
+    :param parent_element: the element that will be scrolled
+    :param child_locator: a selector that will search inside the parent element
+                          for all matching elements
+    :param text: the text to search for in found child elements
+    :param horizontal: if truthy, we scroll horizontally. Otherwise, and in the
+                       default, scroll vertically.
+    :param item_size_px: estimated size of a child element. Optional
+    :param target_offset_px: scroll offset the target is expected at. Optional
+    :param baseline_delta_px: delta_px the fixed step strategy would use, to
+                              estimate its steps for comparison. Optional
+    :return: the WebElement once it is located and visible
+    """
+
+    def __init__(self, parent_element, child_locator, text='', horizontal=False, item_size_px=None,
+                 target_offset_px=None, baseline_delta_px=0):
+        self.parent_element = parent_element
+        self.child_locator = child_locator
+        self.text = text
+        self.horizontal = horizontal
+        self.item_size_px = item_size_px
+        self.target_offset_px = target_offset_px
+        self.baseline_delta_px = baseline_delta_px
+
+        self.steps = 0
+        self.passes = 0
+        self.geometry = None
+        self.start_position = None
+        self._pass_start = None
+        self._pass_size = None
+        self._wrapped = False
+        self._pass_rendered = False
+        self._refine_step = None
+
+    def __call__(self, driver):
+        try:
+            if self.geometry is None:
+                self.geometry = self._scroll_to(driver, None, count_step=False)
+                self.start_position = self._pass_start = self.geometry['position']
+                self._pass_size = self.geometry['size']
+
+            rendered = [element for element in _find_elements(driver, self.child_locator) if element.is_displayed()]
+            self._pass_rendered = self._pass_rendered or bool(rendered)
+            candidates = [element for element in rendered if not self.text or self.text in element.text]
+            found_element = next((element for element in candidates if self._within_parent(element)), None)
+            if found_element:
+                return found_element
+
+            if candidates:
+                self._refine(driver, candidates[0])
+            elif self.target_offset_px is not None and not self.steps:
+                self._scroll_to(driver, self.target_offset_px)
+                self._pass_start = self.geometry['position']
+            else:
+                self._sweep(driver)
+            return False
+
+        except StaleElementReferenceException:
+            return False
+
+    def stats(self):
+        """
+        :return: dict, steps taken, passes made and the estimated steps the
+                 fixed step strategy would have needed (None if unknown)
+        """
+        baseline = None
+        if self.baseline_delta_px and self.geometry:
+            distance = self.geometry['position'] - self.start_position
+            if distance < 0 < self.baseline_delta_px or distance > 0 > self.baseline_delta_px:
+                # the fixed step strategy has to wrap around through the extreme first
+                distance = self.geometry['size'] - self.geometry['client'] - abs(distance)
+            baseline = int(math.ceil(abs(distance) / abs(self.baseline_delta_px)))
+        return {'steps': self.steps, 'passes': self.passes, 'baseline_steps': baseline}
+
+    def _within_parent(self, element):
+        if self.horizontal:
+            return utils.element_is_horizontally_within_parent(self.parent_element, element)
+        return utils.element_is_vertically_within_parent(self.parent_element, element)
+
+    def _refine(self, driver, element):
+        parent_rect = self.parent_element.rect
+        rect = element.rect
+        start, size = ('x', 'width') if self.horizontal else ('y', 'height')
+        # distance to scroll so the element is centered in the parent
+        offset = rect[start] - parent_rect[start] - (self.geometry['client'] - rect[size]) / 2.0
+
+        if rect[size] > parent_rect[size]:
+            self._cannot_fit('is larger than the scrollable element')
+
+        if self._refine_step is None:
+            step = offset
+        else:
+            step = math.copysign(max(abs(self._refine_step) / 2.0, 1), offset)
+        self._refine_step = step
+        position = self.geometry['position']
+        if self._scroll_to(driver, position + step)['position'] == position:
+            self._cannot_fit('is past the end of the scrollable content')
+
+    def _sweep(self, driver):
+        position, size, client = self.geometry['position'], self.geometry['size'], self.geometry['client']
+        overlap = self.item_size_px if self.item_size_px and self.item_size_px < client else 0
+        page = max(client - overlap, 1)
+        max_position = max(size - client, 0)
+        if max_position == 0:
+            # nothing to sweep through (yet), measure again on the next poll in case the content grows
+            self._scroll_to(driver, None, count_step=False)
+            return
+
+        if position >= max_position:
+            next_position = 0
+            self._wrapped = True
+        else:
+            next_position = min(position + page, max_position)
+
+        if self._wrapped and next_position >= self._pass_start:
+            self._complete_pass()
+            next_position = max(next_position, self._pass_start)
+        self._scroll_to(driver, next_position)
+
+    def _complete_pass(self):
+        self.passes += 1
+        # a pass that saw no matching element at all ran while the content was still loading
+        if self.geometry['size'] == self._pass_size and self._pass_rendered:
+            raise WebException('No element matching {} `{}`{} rendered after a full scroll pass; the '
+                               'scrollable content did not change so it never will'.format(
+                                   self.child_locator[0], self.child_locator[1],
+                                   ' containing text `{}`'.format(self.text) if self.text else ''))
+        self._pass_size = self.geometry['size']
+        self._pass_start = self.geometry['position']
+        self._wrapped = False
+        self._pass_rendered = False
+
+    def _cannot_fit(self, reason):
+        raise WebException('Element matching {} `{}`{} rendered but {}; it can never be scrolled within '
+                           'view'.format(self.child_locator[0], self.child_locator[1],
+                                         ' containing text `{}`'.format(self.text) if self.text else '', reason))
+
+    def _scroll_to(self, driver, position, count_step=True):
+        if count_step:
+            self.steps += 1
+        if position is not None:
+            position = int(round(position))
+        self.geometry = scripts.call_async(driver, SCROLL_TO, self.parent_element, position, self.horizontal)
+        return self.geometry
+
+
 # copied from selenium.webdriver.support.expected_conditions to avoid importing
 # private
 def _find_elements(driver, by):
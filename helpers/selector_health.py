@@ -0,0 +1,185 @@
+"""
+Selector health pre-flight: when a page first loads, every selector registered for it (see PAGES in
+app_data/selectors) is counted in one script call. The counts are kept as the page's presence index so waits
+on a registered selector the page did not have fail straight away, with a report of every selector the page is
+missing, instead of after a full timeout. Enabled with --selector-health.
+"""
+import re
+import uuid
+
+from app_data.selectors import amazon, search
+from helpers import scripts
+from helpers.exceptions import WebException
+
+# times a wait asks for the presence index when the page was still loading or is not registered
+MAX_CHECKS_PER_WAIT = 3
+
+# Counts the elements matching each selector (-1 for an invalid selector) once the document has loaded.
+# A document already counted (it carries the token of its pre-flight) only answers that it was.
+PREFLIGHT = scripts.register('selectorPreflight', """
+function(selectors, lastToken, token) {
+  if (lastToken && window.__seleniumPreflight === lastToken) { return {cached: true}; }
+  if (document.readyState !== 'complete') { return {loading: true, url: location.href}; }
+  window.__seleniumPreflight = token;
+  return {url: location.href, counts: selectors.map(function(selector) {
+    try { return document.querySelectorAll(selector).length; } catch (e) { return -1; }
+  })};
+}
+""")
+
+_pages = {}
+_enabled = False
+
+
+def register_pages(pages):
+    """
+    :param pages: dict, page name -> {'url': regex, 'selectors': {name: CSS selector}, 'check_url': optional url}
+    :return: None
+    """
+    for name, page in pages.items():
+        _pages[name] = dict(page, pattern=re.compile(page['url']))
+
+
+register_pages(amazon.PAGES)
+register_pages(search.PAGES)
+
+
+def enable():
+    """
+    Makes go_to_url run the pre-flight and waits fail fast on selectors known to be missing
+    """
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def pages():
+    """
+    :return: dict, page name -> page as registered
+    """
+    return dict(_pages)
+
+
+def page_for(url):
+    """
+    :param url: str
+    :return: str, name of the registered page the url belongs to, None if there is none
+    """
+    return next((name for name, page in _pages.items() if page['pattern'].search(url or '')), None)
+
+
+def preflight(driver):
+    """
+    Builds (or reuses) the presence index of the current page
+
+    :param driver: selenium webdriver
+    :return: dict, {'page': name, 'url': str, 'counts': {selector name: count}}. None while the page is loading
+             or when it is not a registered page
+    """
+    selectors = sorted({selector for page in _pages.values() for selector in page['selectors'].values()})
+    index = getattr(driver, '_selector_index', None)
+    token = uuid.uuid4().hex
+    result = scripts.call(driver, PREFLIGHT, selectors, index['token'] if index else None, token)
+    if not result or result.get('loading'):
+        return None
+    if result.get('cached'):
+        return index['page'] and index
+
+    page = page_for(result['url'])
+    counts = dict(zip(selectors, result['counts']))
+    driver._selector_index = {
+        'token': token,
+        'page': page,
+        'url': result['url'],
+        'counts': {name: counts[selector] for name, selector in _pages[page]['selectors'].items()} if page else {},
+    }
+    return driver._selector_index if page else None
+
+
+def missing(index):
+    """
+    :param index: dict, presence index returned by preflight
+    :return: list of str, the names of the registered selectors the page did not have (or that are invalid)
+    """
+    return sorted(name for name, count in index['counts'].items() if count < 1) if index else []
+
+
+def report(index):
+    """
+    :param index: dict, presence index returned by preflight
+    :return: str, every registered selector of the page with its match count
+    """
+    selectors = _pages[index['page']]['selectors']
+    lines = ['Selector health of {} ({}):'.format(index['page'], index['url'])]
+    for name, count in sorted(index['counts'].items()):
+        lines.append('  {:<8} {} `{}`{}'.format('MISSING' if count < 1 else 'ok', name, selectors[name],
+                                                ' (invalid selector)' if count < 0 else
+                                                '' if count < 1 else ' x{}'.format(count)))
+    return '\n'.join(lines)
+
+
+class PresenceCheck(object):
+    """
+    Checks, for one wait, whether the selectors it still waits on are registered selectors the current page
+    was missing when it loaded, raising WebException with the page's selector report if so.
+    Meant to be called only when a poll's condition is not met, so waits that succeed straight away cost nothing.
+    """
+
+    def __init__(self):
+        self.checks = 0
+
+    def check(self, driver, selectors, all_missing=False):
+        """
+        :param driver: selenium webdriver
+        :param selectors: list of str, CSS selectors the wait still waits on
+        :param all_missing: Boolean, only raise when every selector is known to be missing (e.g. waiting for any)
+                            instead of when one is
+        :return: None
+        """
+        if not _enabled or not selectors or self.checks >= MAX_CHECKS_PER_WAIT:
+            return
+
+        self.checks += 1
+        index = preflight(driver)
+        if index is None:
+            # still loading or not a registered page, ask again on the next poll
+            return
+        # the page is known, whatever it says stays true for the rest of the wait
+        self.checks = MAX_CHECKS_PER_WAIT
+        page_selectors = _pages[index['page']]['selectors']
+        known_missing = {page_selectors[name] for name in missing(index)}
+        doomed = [selector for selector in selectors if selector in known_missing]
+        if doomed and (not all_missing or len(doomed) == len(selectors)):
+            raise WebException('{} {} not on the page when it loaded, not waiting for {}.\n{}'.format(
+                ', '.join('`{}`'.format(selector) for selector in doomed), 'were' if len(doomed) > 1 else 'was',
+                'them' if len(doomed) > 1 else 'it', report(index)))
+
+
+class FailFast(object):
+    """
+    Wraps a wait's condition so a wait on a registered selector the current page was missing when it loaded
+    fails straight away, see PresenceCheck
+    """
+
+    def __init__(self, condition, selector):
+        """
+        :param condition: callable, the wait's condition
+        :param selector: str, CSS selector the condition waits on
+        """
+        self.condition = condition
+        self.selector = selector
+        self.presence = PresenceCheck()
+
+    def __call__(self, driver):
+        result = self.condition(driver)
+        if not result:
+            self.presence.check(driver, [self.selector])
+        return result
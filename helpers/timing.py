@@ -0,0 +1,144 @@
+"""
+Records how long each step of a test flow takes.
+
+Helpers decorated with `timed` (or code wrapped in `step`) report their latency to every active
+StepRecorder. When nothing is recording the overhead is a single list check.
+"""
+import functools
+import math
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+# recorders currently collecting step latencies, see start_recording
+_recorders = []
+
+
+def percentile(values, pct):
+    """
+    Nearest-rank percentile
+
+    :param values: list of numbers
+    :param pct: number, percentile between 0 and 100
+    :return: the value at the percentile, None if there are no values
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100.0 * len(ordered)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+class StepRecorder(object):
+    """
+    Thread-safe collection of step latencies (in seconds) and errors, keyed by step name
+    """
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.errors = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds, error=False):
+        """
+        :param name: str, step name
+        :param seconds: float, time the step took
+        :param error: bool, True if the step raised an exception
+        :return: None
+        """
+        with self._lock:
+            if error:
+                self.errors[name] += 1
+            else:
+                self.samples[name].append(seconds)
+
+    def summary(self, elapsed=None):
+        """
+        Per step count, errors and p50/p95/p99 latency (ms). Includes throughput (per second) if elapsed is given.
+
+        :param elapsed: float, seconds the recording ran for. Optional
+        :return: dict, step name -> stats
+        """
+        with self._lock:
+            names = sorted(set(self.samples) | set(self.errors))
+            stats = {}
+            for name in names:
+                samples = self.samples[name]
+                stats[name] = {
+                    'count': len(samples),
+                    'errors': self.errors[name],
+                    'p50_ms': _to_ms(percentile(samples, 50)),
+                    'p95_ms': _to_ms(percentile(samples, 95)),
+                    'p99_ms': _to_ms(percentile(samples, 99)),
+                }
+                if elapsed:
+                    stats[name]['throughput'] = len(samples) / elapsed
+            return stats
+
+
+def _to_ms(seconds):
+    return None if seconds is None else seconds * 1000
+
+
+def start_recording(recorder):
+    """
+    Sends step latencies to the recorder until stop_recording is called
+
+    :param recorder: StepRecorder
+    :return: the recorder
+    """
+    _recorders.append(recorder)
+    return recorder
+
+
+def stop_recording(recorder):
+    """
+    :param recorder: StepRecorder passed to start_recording
+    :return: None
+    """
+    if recorder in _recorders:
+        _recorders.remove(recorder)
+
+
+@contextmanager
+def step(name):
+    """
+    Times the wrapped block as a step called `name`
+
+    :param name: str, step name
+    """
+    if not _recorders:
+        yield
+        return
+
+    started = time.perf_counter()
+    error = False
+    try:
+        yield
+    except Exception:
+        error = True
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        for recorder in list(_recorders):
+            recorder.record(name, elapsed, error)
+
+
+def timed(name=None):
+    """
+    Decorator that times every call of a helper as a step.
+
+    :param name: str, step name. Default is `<module>.<function>`, e.g. amazon.do_search
+    """
+    def decorator(function):
+        step_name = name or '{}.{}'.format(function.__module__.rsplit('.', 1)[-1], function.__name__)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with step(step_name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
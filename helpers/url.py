@@ -1,10 +1,29 @@
 """
 Manages url navigation
 """
+from helpers import accelerate, perf, scripts, selector_health
+from helpers.timing import timed
+
+
+@timed()
 def go_to_url(driver, url):
+    """
+    Navigates to the url, accelerates the page (when enabled, see helpers.accelerate), checks its selectors
+    (when enabled, see helpers.selector_health) and collects the page's performance data (when enabled,
+    see helpers.perf)
+
+    :param driver: selenium webdriver
+    :param url: str, url to navigate to
+    :return: dict, the performance sample collected for the page. None when not collecting
+    """
     try:
         driver.get(url)
     except Exception:
         print("Could not navigate to {}".format(url))
         raise
+    scripts.forget(driver)
+    accelerate.apply(driver)
+    if selector_health.is_enabled():
+        selector_health.preflight(driver)
+    return perf.collect(driver, 'url.go_to_url')
 
@@ -0,0 +1,46 @@
+"""
+Low-level geometry & rendering utilities shared by the dom and scroll helpers
+"""
+from helpers import scripts
+
+NEXT_FRAME = scripts.register('nextFrame', """
+function(done) {
+  window.requestAnimationFrame(function() { done(); });
+}
+""")
+
+
+def request_animation_frame(driver):
+    """
+    Blocks until the browser has rendered the next animation frame
+
+    :param driver: selenium webdriver
+    :return: None
+    """
+    scripts.call_async(driver, NEXT_FRAME)
+
+
+def element_is_vertically_within_parent(parent_element, element):
+    """
+    Is the element's top & bottom edges inside the parent's top & bottom edges?
+
+    :param parent_element: the (scrollable) container element
+    :param element: a child of parent_element
+    :return: Boolean
+    """
+    parent_rect = parent_element.rect
+    rect = element.rect
+    return parent_rect['y'] <= rect['y'] and rect['y'] + rect['height'] <= parent_rect['y'] + parent_rect['height']
+
+
+def element_is_horizontally_within_parent(parent_element, element):
+    """
+    Is the element's left & right edges inside the parent's left & right edges?
+
+    :param parent_element: the (scrollable) container element
+    :param element: a child of parent_element
+    :return: Boolean
+    """
+    parent_rect = parent_element.rect
+    rect = element.rect
+    return parent_rect['x'] <= rect['x'] and rect['x'] + rect['width'] <= parent_rect['x'] + parent_rect['width']
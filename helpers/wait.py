@@ -33,15 +33,23 @@ def until_page_title_is(driver, expected_page_title, timeout=DEFAULT_TIMEOUT):
     :param expected_page_title: str, expected page title
     :param timeout: time to wait before raising exception
     """
+    message = 'Expected page title "{}"'.format(expected_page_title)
+
+    dom.wait_until(driver, page_title_condition(expected_page_title), message, timeout)
+
+
+def page_title_condition(expected_page_title):
+    """
+    Condition met when the page title matches the expected page title.
+    Useful for waiting on the title together with other conditions, see dom.wait_all
+
+    :param expected_page_title: str, expected page title
+    :return: ElementCriteriaCondition
+    """
 
     def title_filter_function(element):
         page_title = element.get_attribute('textContent')
         return True if page_title == expected_page_title else False
 
-    page_title_condition = ElementCriteriaCondition(
+    return ElementCriteriaCondition(
         (By.TAG_NAME, 'title'), must_be_visible=False, filter_function=title_filter_function)
-
-    message = 'Expected page title "{}"'.format(expected_page_title)
-
-    dom.wait_until(driver, page_title_condition, message, timeout)
-
@@ -0,0 +1,49 @@
+"""
+Load runner entry point.
+
+    python -m loadgen --flow search_and_add_to_cart --base-url https://staging.example.com/ --users 10 --ramp 30
+    python -m loadgen --stand-in --users 2 --duration 20
+"""
+import argparse
+
+from helpers.driver_pool import chrome_factory
+from loadgen.flows import FLOWS
+from loadgen.runner import LoadRunner, format_report
+from loadgen.standin_server import StandInServer
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--flow', choices=sorted(FLOWS), default='search', help='user journey to replay')
+    parser.add_argument('--base-url', help='storefront home page to put load on')
+    parser.add_argument('--stand-in', action='store_true', help='run against a local stand-in storefront')
+    parser.add_argument('--users', type=int, default=1, help='target number of concurrent users')
+    parser.add_argument('--ramp', type=float, default=0, help='seconds taken to start all users')
+    parser.add_argument('--duration', type=float, default=60, help='seconds to generate load for')
+    parser.add_argument('--think-time', type=float, default=0, help='seconds a user pauses between flows')
+    parser.add_argument('--driver-path', help='path to chromedriver')
+    parser.add_argument('--show-browser', action='store_true', help='do not run the browsers headless')
+    options = parser.parse_args(args)
+
+    if not options.base_url and not options.stand_in:
+        parser.error('one of --base-url or --stand-in is required')
+
+    stand_in = StandInServer().start() if options.stand_in else None
+    try:
+        runner = LoadRunner(FLOWS[options.flow],
+                            stand_in.url if stand_in else options.base_url,
+                            users=options.users,
+                            ramp_seconds=options.ramp,
+                            duration=options.duration,
+                            think_time=options.think_time,
+                            driver_factory=chrome_factory(not options.show_browser, options.driver_path))
+        summary = runner.run()
+    finally:
+        if stand_in:
+            stand_in.stop()
+
+    print(format_report(summary, runner.elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+User journeys the load runner can replay. Each flow takes (driver, base_url) and is built from the same
+helpers the tests use, so their steps are timed by helpers.timing.
+"""
+from app_data.selectors.amazon import AMAZON_CHOICE, PRODUCT_TITLE
+from helpers import amazon, dom, url, wait
+from helpers.timing import step
+
+DEFAULT_SEARCH_TERM = 'teacups'
+
+
+def search(driver, base_url, search_term=DEFAULT_SEARCH_TERM):
+    """
+    Opens the home page and searches for a term
+
+    :param driver: selenium webdriver
+    :param base_url: str, storefront home page
+    :param search_term: str, text to search for
+    :return: None
+    """
+    url.go_to_url(driver, base_url)
+    amazon.do_search(driver, search_term)
+
+
+def search_and_add_to_cart(driver, base_url, search_term=DEFAULT_SEARCH_TERM):
+    """
+    Searches for a term, adds the "Amazon's Choice" pick to the cart and checks it is in the cart
+
+    :param driver: selenium webdriver
+    :param base_url: str, storefront home page
+    :param search_term: str, text to search for
+    :return: None
+    """
+    search(driver, base_url, search_term)
+
+    with step('flows.open_product'):
+        dom.click_element(driver, AMAZON_CHOICE)
+        product_name = wait.until_visible(driver, PRODUCT_TITLE).text
+
+    amazon.add_to_cart(driver)
+    amazon.go_to_cart(driver)
+    amazon.verify_items_in_cart(driver, product_name)
+
+
+FLOWS = {
+    'search': search,
+    'search_and_add_to_cart': search_and_add_to_cart,
+}
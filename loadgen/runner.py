@@ -0,0 +1,123 @@
+"""
+Replays a flow from loadgen.flows as concurrent synthetic users, each driving its own headless browser.
+"""
+import threading
+import time
+
+from helpers import timing
+from helpers.driver_pool import DriverPool, chrome_factory
+
+# step name the whole flow is recorded under
+FLOW_STEP = 'flow'
+
+
+class LoadRunner(object):
+    """
+    Starts `users` synthetic users spread linearly over `ramp_seconds`. Each user repeats the flow
+    until `duration` seconds after the first user started.
+    """
+
+    def __init__(self,
+                 flow,
+                 base_url,
+                 users=1,
+                 ramp_seconds=0,
+                 duration=60,
+                 think_time=0,
+                 driver_factory=None):
+        """
+        :param flow: function, takes (driver, base_url), see loadgen.flows
+        :param base_url: str, storefront home page
+        :param users: int, target number of concurrent users
+        :param ramp_seconds: float, time taken to start all the users
+        :param duration: float, seconds the load runs for, including the ramp
+        :param think_time: float, seconds a user pauses between flows
+        :param driver_factory: function, takes a user-data-dir and returns a started webdriver.
+                               Default is headless Chrome
+        """
+        if users < 1:
+            raise ValueError('At least one user is needed to generate load')
+
+        self.flow = flow
+        self.base_url = base_url
+        self.users = users
+        self.ramp_seconds = ramp_seconds
+        self.duration = duration
+        self.think_time = think_time
+        self.driver_factory = driver_factory or chrome_factory(headless=True)
+        self.recorder = timing.StepRecorder()
+        self.elapsed = 0.0
+
+    def run(self):
+        """
+        Generates the load and blocks until every user has finished
+
+        :return: dict, step name -> count, errors, throughput & p50/p95/p99 latency (see StepRecorder.summary)
+        """
+        # every user takes one browser for the whole run, replacements would never be used
+        pool = DriverPool(self.driver_factory, size=self.users, replenish=False)
+        pool.start()
+        timing.start_recording(self.recorder)
+
+        started = time.monotonic()
+        stop_at = started + self.duration
+        threads = [
+            threading.Thread(target=self._user, args=(pool, started + self._start_offset(i), stop_at), daemon=True)
+            for i in range(self.users)
+        ]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            timing.stop_recording(self.recorder)
+            pool.close()
+
+        self.elapsed = time.monotonic() - started
+        return self.recorder.summary(self.elapsed)
+
+    def _start_offset(self, user_index):
+        return self.ramp_seconds * user_index / self.users
+
+    def _user(self, pool, start_at, stop_at):
+        time.sleep(max(start_at - time.monotonic(), 0))
+        try:
+            driver = pool.acquire(timeout=max(stop_at - time.monotonic(), 0))
+        except Exception:
+            self.recorder.record('browser', 0, error=True)
+            return
+
+        try:
+            while time.monotonic() < stop_at:
+                try:
+                    with timing.step(FLOW_STEP):
+                        self.flow(driver, self.base_url)
+                except Exception:
+                    # error is recorded by the step, keep the user generating load
+                    pass
+                if self.think_time:
+                    time.sleep(self.think_time)
+        finally:
+            pool.release(driver)
+
+
+def format_report(summary, elapsed=None):
+    """
+    Formats a LoadRunner summary as a table
+
+    :param summary: dict, returned by LoadRunner.run
+    :param elapsed: float, seconds the load ran for. Optional
+    :return: str
+    """
+    def ms(value):
+        return '-' if value is None else '{:.0f}'.format(value)
+
+    row = '{:<40} {:>7} {:>7} {:>9} {:>8} {:>8} {:>8}'
+    lines = [row.format('step', 'count', 'errors', 'per sec', 'p50 ms', 'p95 ms', 'p99 ms')]
+    for name, stats in summary.items():
+        lines.append(row.format(name, stats['count'], stats['errors'], '{:.2f}'.format(stats.get('throughput', 0)),
+                                ms(stats['p50_ms']), ms(stats['p95_ms']), ms(stats['p99_ms'])))
+    if elapsed:
+        lines.append('ran for {:.1f}s'.format(elapsed))
+    return '\n'.join(lines)
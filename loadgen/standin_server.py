@@ -0,0 +1,157 @@
+"""
+A local stand-in for the storefront so the load runner (and its tests) can run without hitting staging.
+
+Serves just enough of the home, search results, product and cart pages for the helpers.amazon flows
+to work, using the same selectors as app_data.selectors.amazon.
+"""
+import html
+import threading
+import time
+import uuid
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+HOME_TITLE = 'Amazon.com: Online Shopping for Electronics, Apparel, Computers, Books, DVDs & more'
+PRODUCTS = {
+    '1': 'Porcelain Teacup Set',
+    '2': 'Bamboo Tea Tray',
+}
+PAGE_SIZE = 48
+
+PAGE = """<!DOCTYPE html>
+<html><head><title>{title}</title></head>
+<body>
+  <form action="/s" method="get">
+    <span class="nav-search-scope">All</span>
+    <input id="twotabsearchtextbox" name="k" type="text" value="{search_term}">
+    <input class="nav-input" type="submit" value="Go">
+  </form>
+  <a id="nav-cart" href="/cart">Cart</a>
+  {body}
+</body></html>"""
+
+RESULTS = """
+<div class="s-search-results">
+  <div cel_widget_id="UPPER-RESULT_INFO_BAR">
+    <span class="sg-col-inner">{low}-{high} of over 30,000 results for "{search_term}"</span>
+  </div>
+  <div class="s-result-item">
+    <span aria-label="Amazon's Choice"><a class="a-badge-region" href="/dp/1">Amazon's Choice</a></span>
+    <span>{product}</span>
+  </div>
+  <ul><li class="a-last"><a href="/s?k={quoted_term}&page={next_page}">Next</a></li></ul>
+</div>"""
+
+PRODUCT = """
+<span id="productTitle">{product}</span>
+<form action="/cart/add" method="get">
+  <input type="hidden" name="id" value="{product_id}">
+  <input id="add-to-cart-button" type="submit" value="Add to Cart">
+</form>"""
+
+ADDED_TO_CART = """
+<h1>Added to Cart</h1>
+<a id="hlb-view-cart-announce" href="/cart">Cart</a>"""
+
+CART = """<ul>{items}</ul>"""
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    server_version = 'StandInStorefront/1.0'
+
+    def log_message(self, format, *args):
+        # keep test & load runner output clean
+        pass
+
+    def do_GET(self):
+        if self.server.delay:
+            time.sleep(self.server.delay)
+
+        parsed = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+        self.session, cart = self._session()
+
+        if parsed.path == '/':
+            self._page(HOME_TITLE, '')
+        elif parsed.path == '/s':
+            search_term = query.get('k', '')
+            page = int(query.get('page', 1))
+            self._page('Amazon.com : {}'.format(search_term), RESULTS.format(
+                low=(page - 1) * PAGE_SIZE + 1,
+                high=page * PAGE_SIZE,
+                search_term=html.escape(search_term),
+                quoted_term=html.escape(search_term.replace(' ', '+')),
+                next_page=page + 1,
+                product=html.escape(PRODUCTS['1'])), search_term)
+        elif parsed.path.startswith('/dp/') and parsed.path[4:] in PRODUCTS:
+            product_id = parsed.path[4:]
+            self._page('Amazon.com: {}'.format(PRODUCTS[product_id]),
+                       PRODUCT.format(product=html.escape(PRODUCTS[product_id]), product_id=product_id))
+        elif parsed.path == '/cart/add' and query.get('id') in PRODUCTS:
+            cart.append(query['id'])
+            self._page('Amazon.com Shopping Cart', ADDED_TO_CART)
+        elif parsed.path == '/cart':
+            items = ''.join('<li><span class="sc-product-title">{}</span></li>'.format(html.escape(PRODUCTS[i]))
+                            for i in cart)
+            self._page('Amazon.com Shopping Cart', CART.format(items=items))
+        else:
+            self.send_error(404)
+
+    def _session(self):
+        cookie = SimpleCookie(self.headers.get('Cookie', ''))
+        session = cookie['session-id'].value if 'session-id' in cookie else uuid.uuid4().hex
+        with self.server.lock:
+            return session, self.server.carts.setdefault(session, [])
+
+    def _page(self, title, body, search_term=''):
+        content = PAGE.format(title=html.escape(title), search_term=html.escape(search_term), body=body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(content)))
+        # every page keeps the session so the cart follows the synthetic user
+        self.send_header('Set-Cookie', 'session-id={}; Path=/'.format(self.session))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class StandInServer(object):
+    """
+    Runs the stand-in storefront in a background thread.
+
+        with StandInServer() as server:
+            go_to_url(driver, server.url)
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, delay=0.0):
+        """
+        :param host: str, interface to listen on
+        :param port: int, port to listen on. Default picks a free port
+        :param delay: float, seconds added to every response to imitate server work
+        """
+        self._server = ThreadingHTTPServer((host, port), _StandInHandler)
+        self._server.daemon_threads = True
+        self._server.delay = delay
+        self._server.carts = {}
+        self._server.lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return 'http://{}:{}/'.format(host, port)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
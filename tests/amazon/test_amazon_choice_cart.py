@@ -2,22 +2,23 @@ import pytest
 
 from app_data.selectors.amazon import AMAZON_CHOICE, PRODUCT_TITLE
 from helpers import dom
-from helpers.amazon import do_search, add_to_cart, go_to_cart, verify_items_in_cart
+from helpers.amazon import add_to_cart, go_to_cart, verify_items_in_cart
 
 URL = {
     'link': 'https://www.amazon.com/',
-    'title': 'Amazon.com: Online Shopping for Electronics, Apparel, Computers, Books, DVDs & more'
+    'title': 'Amazon.com: Online Shopping for Electronics, Apparel, Computers, Books, DVDs & more',
+    'perf_thresholds': {'lcp_ms': 4000, 'cls': 0.25, 'long_tasks': 20}
 }
 
 
-@pytest.mark.usefixtures("open_url")
+@pytest.mark.mutates_page_state
 @pytest.mark.parametrize("search_term", ("teacups",))
-def test_amazon_search_summary(selenium, search_term):
+def test_amazon_search_summary(selenium, amazon_search_results, search_term):
     """
     This test validates adding an "Amazon's Choice" item to the cart shows up in the cart list.
     """
     # search for results
-    do_search(selenium, search_term)
+    amazon_search_results(search_term)
 
     # add Amazon's Choice pick to cart
     dom.click_element(selenium, AMAZON_CHOICE)
@@ -6,7 +6,9 @@ repetitive in all tests are great candidates for turning in a fixture.
 """
 import pytest
 
-from helpers import dom, url, wait
+from app_data.selectors.amazon import UPPER_RESULT_INFO
+from helpers import amazon, dom, perf, url, wait
+from helpers.page_state import PageStateCache
 
 
 @pytest.fixture(scope='function')
@@ -20,13 +22,63 @@ def open_url(request, selenium):
             'link': 'url link',
             'title': 'url page title'
             'pop-up': 'css'
+            'perf_thresholds': {'lcp_ms': 4000, 'cls': 0.25}
         }
+    'pop-up' and 'perf_thresholds' are optional. Thresholds are checked when --web-vitals is specified,
+    see helpers.perf.METRICS for the metrics available.
+    """
+    _open_url(selenium, getattr(request.module, 'URL'))
+
+
+@pytest.fixture(scope='session')
+def page_states(request):
+    """
+    Page states shared by every test of the session, see helpers.page_state
+    """
+    request.config._page_states = PageStateCache()
+    return request.config._page_states
+
+
+@pytest.fixture(scope='function')
+def amazon_search_results(request, selenium, page_states):
+    """
+    Brings the browser to the search results for a term on the test module's URL. The first test to need a
+    (URL, search term) pair opens the page and searches, later tests restore the results page from the cache.
+
+    Tests that change what the cached state depends on (e.g. add to the cart of the session it restores)
+    should be marked with @pytest.mark.mutates_page_state so the states they used are rebuilt afterwards.
+        def test_search(selenium, amazon_search_results):
+            amazon_search_results('teacups')
     """
     url_info = getattr(request.module, 'URL')
-    url.go_to_url(selenium, url_info['link'])
-    wait.until_page_title_is(selenium, url_info['title'])
+    used = []
+
+    def search_results(search_term):
+        key = (url_info['link'], search_term)
+        used.append(key)
+
+        def build(driver):
+            _open_url(driver, url_info)
+            amazon.do_search(driver, search_term)
+
+        page_states.reach(selenium, key, build, UPPER_RESULT_INFO)
+
+    yield search_results
+
+    if request.node.get_closest_marker('mutates_page_state'):
+        page_states.invalidate(*used)
+
+
+def _open_url(driver, url_info):
+    perf_sample = url.go_to_url(driver, url_info['link'])
+
+    # wait for the title and any pop-up that appears after navigating to page together
+    page_ready = {'title': wait.page_title_condition(url_info['title'])}
+    if 'pop-up' in url_info:
+        page_ready['pop-up'] = url_info['pop-up']
+    dom.wait_all(driver, page_ready)
+    perf.verify_thresholds(perf_sample, url_info.get('perf_thresholds'))
 
     # close any pop-ups that appear after navigating to page
     if 'pop-up' in url_info:
-        wait.until_visible(selenium, url_info['pop-up'])
-        dom.click_element(selenium, url_info['pop-up'])
+        dom.click_element(driver, url_info['pop-up'])
@@ -0,0 +1,29 @@
+import subprocess
+
+from distributed import runner
+from distributed.scheduler import Node
+
+
+def run_command(monkeypatch, pytest_args):
+    commands = []
+
+    def fake_run(command, **kwargs):
+        commands.append(command)
+        return subprocess.CompletedProcess(command, 0)
+
+    monkeypatch.setattr(runner.subprocess, 'run', fake_run)
+    assert runner.pytest_runner(pytest_args)('tests/amazon/test_search.py::test_search', Node('10.0.0.5', 4444)) == 0
+    return commands[0]
+
+
+def test_remote_tests_ask_for_chrome(monkeypatch):
+    """
+    This test validates tests run on a node ask it for chrome, unless the pytest arguments ask for another browser.
+    """
+    command = run_command(monkeypatch, ['--headless'])
+    assert command[-4:] == ['--capability', 'browserName', 'chrome', '--headless']
+    assert command[command.index('--selenium-host') + 1] == '10.0.0.5'
+
+    command = run_command(monkeypatch, ['--capability', 'browserName', 'firefox'])
+    assert command.count('--capability') == 1
+    assert command[-1] == 'firefox'
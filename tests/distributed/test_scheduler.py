@@ -0,0 +1,61 @@
+import threading
+from urllib.error import URLError
+from urllib.request import urlopen
+
+import pytest
+
+from distributed.scheduler import NodeFailure, Scheduler
+from distributed.standin_hub import StandInHub
+
+TEST_SECONDS = 0.2
+
+
+@pytest.fixture
+def hub():
+    with StandInHub(node_slots=(2, 1, 1)) as hub:
+        yield hub
+
+
+def run_simulated_test(task, node):
+    try:
+        with urlopen('{}/run?seconds={}'.format(node.url, TEST_SECONDS), timeout=5) as response:
+            return response.status
+    except (URLError, OSError) as e:
+        raise NodeFailure(str(e))
+
+
+def test_dispatch_respects_node_capacity(hub):
+    """
+    This test validates every task runs once and no node runs more tasks at once than it has slots.
+    """
+    scheduler = Scheduler.from_hub(hub.url)
+
+    results = scheduler.dispatch(range(12), run_simulated_test)
+
+    assert sorted(result.task for result in results) == list(range(12))
+    assert all(result.result == 200 and result.attempts == 1 for result in results)
+    for node in hub.nodes:
+        assert 0 < node.max_running <= node.slots, "Node ran {} tests at once with {} slots".format(
+            node.max_running, node.slots)
+
+
+def test_tasks_from_a_dead_node_are_requeued(hub):
+    """
+    This test validates tasks running on a node that dies mid-test are requeued on the remaining nodes.
+    """
+    scheduler = Scheduler.from_hub(hub.url, health_interval=60)
+    dying_node = hub.nodes[0]
+    threading.Timer(TEST_SECONDS / 2, dying_node.kill).start()
+
+    results = scheduler.dispatch(range(8), run_simulated_test)
+
+    assert sorted(result.task for result in results) == list(range(8))
+    assert dying_node.dropped, "Expected the node to die while running tests"
+    assert dying_node.completed == 0
+    failed = [result.task for result in results if result.error]
+    assert not failed, "Tasks failed instead of being requeued: {}".format(failed)
+    requeued = [result for result in results if result.attempts > 1]
+    assert requeued, "Expected the tasks running on the dead node to be requeued"
+    assert all(result.nodes[-1].port != dying_node.port for result in requeued)
+    assert sum(result.nodes[0].port == dying_node.port for result in requeued) >= dying_node.dropped
+    assert not next(node for node in scheduler.nodes if node.port == dying_node.port).healthy
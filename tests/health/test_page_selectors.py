@@ -0,0 +1,18 @@
+import pytest
+
+from helpers import selector_health, url
+
+CHECKED_PAGES = {name: page for name, page in selector_health.pages().items() if 'check_url' in page}
+
+
+@pytest.mark.parametrize("page_name", sorted(CHECKED_PAGES))
+def test_selector_health(selenium, page_name):
+    """
+    This test validates every selector registered for a page (see PAGES in app_data/selectors) matches once the
+    page has loaded. Run on its own as a fast health check of the selectors: pytest tests/health
+    """
+    url.go_to_url(selenium, CHECKED_PAGES[page_name]['check_url'])
+    index = selector_health.preflight(selenium)
+
+    assert index and index['page'] == page_name, "{} did not load as {}".format(selenium.current_url, page_name)
+    assert not selector_health.missing(index), selector_health.report(index)
@@ -0,0 +1,43 @@
+import pytest
+
+from helpers import accelerate
+from helpers.fake_driver import FakeDriver
+
+
+@pytest.fixture
+def accelerated():
+    accelerate.start(timer_factor=10)
+    yield
+    accelerate.stop()
+
+
+def test_browser_prepared_once(accelerated):
+    """
+    This test validates a DevTools browser is prepared once for every new document and pages are then left alone.
+    """
+    driver = FakeDriver()
+    assert accelerate.prepare(driver)
+    assert accelerate.prepare(driver)
+    assert driver.commands['executeCdpCommand'] == 2
+    assert 'transition-duration: 0s' in driver.new_document_scripts[0]
+    assert driver.new_document_scripts[0].rstrip().endswith(', 10);')
+
+    accelerate.apply(driver)
+    assert driver.commands['executeScript'] == 0
+
+
+def test_time_saved_against_baseline(tmpdir):
+    """
+    This test validates the time saved is reported for tests with a baseline & an accelerated duration only.
+    """
+    path = str(tmpdir.join('durations.json'))
+    store = accelerate.DurationStore(path)
+    store.record('test_a', 10.0, accelerated=False)
+    store.record('test_b', 4.0, accelerated=False)
+    store.save()
+
+    store = accelerate.DurationStore(path)
+    store.record('test_a', 6.5, accelerated=True)
+    store.record('test_c', 1.0, accelerated=True)
+    assert store.savings() == [('test_a', 10.0, 6.5, 3.5)]
+    assert store.savings(['test_b', 'test_c']) == []
@@ -0,0 +1,85 @@
+import pytest
+from selenium.webdriver.common.by import By
+
+from helpers import dom, scripts
+from helpers.dom import ElementCriteriaCondition, WebException
+from helpers.fake_driver import FakeDriver, FakeElement
+
+TITLE = '#title'
+BUTTON = '#button'
+BANNER = '.banner'
+
+
+@pytest.fixture
+def driver():
+    """
+    Page whose title shows straight away, button after 0.2s and banner never
+    """
+    return FakeDriver(FakeElement('html', children=[
+        FakeElement('h1', 'Product', attributes={'id': 'title'}),
+        FakeElement('button', 'Buy', attributes={'id': 'button'}, appear_after=0.2),
+        FakeElement('div', 'Sale', attributes={'class': 'banner'}, displayed=False),
+    ]))
+
+
+def test_wait_all_returns_every_result(driver):
+    """
+    This test validates wait_all waits for conditions met at different times and maps each to its result.
+    """
+    results = dom.wait_all(driver, {
+        'title': TITLE,
+        'button': (By.CSS_SELECTOR, BUTTON),
+        'texts': ElementCriteriaCondition((By.TAG_NAME, 'h1'), return_all_matching=True),
+    }, timeout=2)
+
+    assert results['title'].text == 'Product'
+    assert results['button'].text == 'Buy'
+    assert [element.text for element in results['texts']] == ['Product']
+
+
+def test_wait_all_batches_css_lookups(driver):
+    """
+    This test validates a poll finds the elements of every CSS condition with a single command.
+    """
+    # helper scripts already in the page, so the poll does not also inject them
+    scripts.inject(driver)
+    driver.commands.clear()
+    dom.wait_all(driver, [TITLE, 'h1'], timeout=2)
+
+    assert driver.commands['findElements'] == 0
+    assert driver.commands['executeScript'] == 1, "Expected 1 script call for the poll:\n{}".format(driver.commands)
+
+
+def test_wait_any_and_first(driver):
+    """
+    This test validates wait_any returns every condition met and wait_first only the first one met.
+    """
+    assert set(dom.wait_any(driver, [BUTTON, TITLE], timeout=2)) == {TITLE}
+    assert list(dom.wait_first(driver, {'banner': BANNER, 'title': TITLE, 'h1': 'h1'}, timeout=2)) == ['title']
+
+
+def test_wait_all_reports_conditions_not_met(driver):
+    """
+    This test validates a timeout names the conditions that were never met.
+    """
+    with pytest.raises(WebException) as error:
+        dom.wait_all(driver, {'title': TITLE, 'banner': BANNER}, timeout=0.5)
+
+    assert 'banner' in error.value.msg
+    assert 'title' not in error.value.msg
+
+
+def test_wait_all_met_in_the_same_poll():
+    """
+    This test validates wait_all returns results from a single poll, not elements met earlier that went stale.
+    """
+    driver = FakeDriver(FakeElement('html', children=[
+        FakeElement('div', 'old summary', attributes={'id': 'summary'}, stale_after=0.3),
+        FakeElement('div', 'new summary', attributes={'id': 'summary'}, appear_after=0.3),
+        FakeElement('div', 'results', attributes={'id': 'results'}, appear_after=0.6),
+    ]))
+
+    results = dom.wait_all(driver, {'s': '#summary', 'r': '#results'}, timeout=3)
+
+    assert results['s'].text == 'new summary'
+    assert results['r'].text == 'results'
@@ -0,0 +1,166 @@
+import os
+import time
+
+import pytest
+
+from helpers.driver_pool import DriverPool
+from helpers.exceptions import WebException
+from helpers.fake_driver import FakeDriver
+
+
+def fake_factory(launched, fail_first=0, delay=0):
+    """
+    Driver factory launching FakeDrivers, recording each one with the files its profile started with.
+    The first `fail_first` launches raise, every launch takes `delay` seconds.
+    """
+    def launch(user_data_dir):
+        time.sleep(delay)
+        if fail_first > len(launched):
+            launched.append(None)
+            raise RuntimeError('chromedriver not found')
+        driver = FakeDriver()
+        driver.profile_dir = user_data_dir
+        driver.profile_files = sorted(os.path.relpath(os.path.join(root, name), user_data_dir)
+                                      for root, _, names in os.walk(user_data_dir) for name in names)
+        launched.append(driver)
+        return driver
+
+    return launch
+
+
+def wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, 'Timed out waiting for the pool'
+        time.sleep(0.01)
+
+
+def test_acquire_launches_a_replacement():
+    """
+    This test validates every browser taken from the pool is replaced so it stays `size` browsers ahead.
+    """
+    launched = []
+    pool = DriverPool(fake_factory(launched), size=2)
+    pool.start()
+    wait_for(lambda: len(pool.cold_start_times) == 2)
+
+    driver = pool.acquire(timeout=5)
+    wait_for(lambda: len(pool.cold_start_times) == 3)
+    assert driver in launched
+
+    summary = pool.summary()
+    assert (summary['browsers_launched'], summary['browsers_used']) == (3, 1)
+    assert summary['profile_template_time'] == 0.0
+
+    pool.release(driver)
+    assert driver.commands['quit'] == 1
+    assert not os.path.exists(driver.profile_dir)
+    pool.close()
+
+
+def test_failed_launch_raises_on_acquire():
+    """
+    This test validates a browser that fails to launch raises WebException from acquire without leaving its profile.
+    """
+    launched = []
+    pool = DriverPool(fake_factory(launched, fail_first=1), size=1)
+    pool.start()
+
+    with pytest.raises(WebException) as e:
+        pool.acquire(timeout=5)
+    assert 'chromedriver not found' in str(e.value)
+
+    # the replacement launched after the failure works
+    driver = pool.acquire(timeout=5)
+    assert driver is launched[1]
+    pool.release(driver)
+    pool.close()
+
+
+def test_close_quits_idle_browsers():
+    """
+    This test validates close quits the browsers never used and removes their profiles.
+    """
+    launched = []
+    pool = DriverPool(fake_factory(launched), size=3)
+    pool.start()
+    wait_for(lambda: len(pool.cold_start_times) == 3)
+
+    pool.close()
+    assert [driver.commands['quit'] for driver in launched] == [1, 1, 1]
+    assert not any(os.path.exists(driver.profile_dir) for driver in launched)
+    with pytest.raises(WebException):
+        pool.acquire(timeout=0.1)
+
+
+def test_close_waits_for_launches_under_way():
+    """
+    This test validates close waits for browsers still launching and quits them instead of leaving them running.
+    """
+    launched = []
+    pool = DriverPool(fake_factory(launched, delay=0.3), size=2)
+    pool.start()
+    time.sleep(0.1)
+
+    pool.close()
+    assert len(launched) == 2
+    assert [driver.commands['quit'] for driver in launched] == [1, 1]
+    assert not any(os.path.exists(driver.profile_dir) for driver in launched)
+
+
+def test_close_while_building_the_profile_template():
+    """
+    This test validates closing the pool while its profile template is being built still removes the template
+    and launches no browsers.
+    """
+    launched = []
+    pool = DriverPool(fake_factory(launched, delay=0.3), size=2, prepare_template=True)
+    pool.start()
+    time.sleep(0.1)
+
+    pool.close()
+    assert len(launched) == 1
+    template = launched[0]
+    assert template.commands['quit'] == 1
+    assert not os.path.exists(template.profile_dir)
+    assert pool.cold_start_times == []
+
+
+def test_profile_template_copied_without_lock_files(tmpdir):
+    """
+    This test validates every browser starts from a copy of the profile template, minus the files a running
+    browser locks.
+    """
+    template = tmpdir.mkdir('template')
+    template.mkdir('Default').join('Preferences').write('{}')
+    for lock_file in ('SingletonLock', 'lockfile', 'parent.lock'):
+        template.join(lock_file).write('')
+
+    launched = []
+    pool = DriverPool(fake_factory(launched), size=1, profile_template=str(template))
+    pool.start()
+    driver = pool.acquire(timeout=5)
+
+    assert driver.profile_files == [os.path.join('Default', 'Preferences')]
+    assert driver.profile_dir != str(template)
+    pool.release(driver)
+    pool.close()
+    assert template.join('Default', 'Preferences').check()
+
+
+def test_pool_without_replenishing():
+    """
+    This test validates a pool that does not replenish launches `size` browsers in total.
+    """
+    launched = []
+    pool = DriverPool(fake_factory(launched), size=2, replenish=False)
+    pool.start()
+    drivers = [pool.acquire(timeout=5), pool.acquire(timeout=5)]
+    time.sleep(0.1)
+
+    assert len(launched) == 2
+    with pytest.raises(WebException):
+        pool.acquire(timeout=0.1)
+    for driver in drivers:
+        pool.release(driver)
+    pool.close()
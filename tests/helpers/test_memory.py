@@ -0,0 +1,94 @@
+import csv
+
+import pytest
+
+from helpers.fake_driver import FakeDriver
+from helpers.memory import SoakMonitor, fit_trend
+
+
+def leaking_driver(nodes_per_sample=0):
+    """
+    FakeDriver without DevTools whose page grows by nodes_per_sample DOM nodes every time memory is read
+    """
+    driver = FakeDriver()
+    reads = []
+
+    def read_memory(driver):
+        reads.append(1)
+        return {'heap_used': 20 * 1024 * 1024, 'dom_nodes': 1000 + nodes_per_sample * len(reads), 'listeners': None}
+
+    driver.add_script_hook('performance.memory', read_memory)
+    return driver
+
+
+def test_fit_trend():
+    """
+    This test validates the fitted line of exact, flat and degenerate series.
+    """
+    assert fit_trend([1, 2, 3, 4], [3, 5, 7, 9]) == pytest.approx((2.0, 1.0))
+    assert fit_trend([1, 2, 3], [4, 4, 4]) == pytest.approx((0.0, 4.0))
+    assert fit_trend([5], [7]) == (0.0, 7)
+    assert fit_trend([], []) == (0.0, 0.0)
+    assert fit_trend([2, 2], [1, 3]) == (0.0, 2.0)
+
+
+def test_after_iteration_samples_every_n_iterations():
+    """
+    This test validates memory is sampled on the first iteration of a flow then every `sample_every` iterations,
+    counted separately per flow.
+    """
+    driver = leaking_driver()
+    monitor = SoakMonitor(sample_every=3)
+
+    sampled = [monitor.after_iteration(driver, 'search') is not None for _ in range(7)]
+    monitor.after_iteration(driver, 'cart')
+
+    assert sampled == [True, False, True, False, False, True, False]
+    assert [s['iteration'] for s in monitor.samples['search']] == [1, 3, 6]
+    assert [s['iteration'] for s in monitor.samples['cart']] == [1]
+    assert monitor.iterations == {'search': 7, 'cart': 1}
+    assert monitor.samples['search'][0]['heap_mb'] == 20.0
+    with pytest.raises(ValueError):
+        SoakMonitor(sample_every=0)
+
+
+def test_trends_flag_flows_growing_past_threshold():
+    """
+    This test validates a flow whose DOM keeps growing is flagged while a flat one is not, and that metrics
+    without enough samples (or never available) are left out.
+    """
+    monitor = SoakMonitor(sample_every=1, max_growth={'dom_nodes': 100})
+    leaking, steady = leaking_driver(nodes_per_sample=50), leaking_driver()
+    for _ in range(5):
+        monitor.after_iteration(leaking, 'search')
+        monitor.after_iteration(steady, 'cart')
+    monitor.after_iteration(leaking, 'checkout')
+
+    trends = monitor.trends()
+    assert trends['search']['dom_nodes']['per_iteration'] == pytest.approx(50.0)
+    assert trends['search']['dom_nodes']['growth'] == pytest.approx(200.0)
+    assert trends['search']['dom_nodes']['flagged']
+    assert not trends['cart']['dom_nodes']['flagged']
+    assert 'listeners' not in trends['search']
+    assert trends['checkout'] == {}
+    assert monitor.flagged() == {'search': ['dom_nodes']}
+
+
+def test_write_csv(tmpdir):
+    """
+    This test validates every sample is written as one row, with unavailable metrics left empty.
+    """
+    monitor = SoakMonitor(sample_every=2)
+    driver = leaking_driver(nodes_per_sample=10)
+    for _ in range(4):
+        monitor.after_iteration(driver, 'search')
+    path = str(tmpdir.join('soak', 'memory.csv'))
+
+    monitor.write_csv(path)
+
+    with open(path, newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ['flow', 'iteration', 'timestamp', 'heap_mb', 'dom_nodes', 'listeners']
+    assert [row[:2] + row[3:] for row in rows[1:]] == [['search', '1', '20.000', '1010', ''],
+                                                       ['search', '2', '20.000', '1020', ''],
+                                                       ['search', '4', '20.000', '1030', '']]
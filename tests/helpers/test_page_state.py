@@ -0,0 +1,152 @@
+import pytest
+from selenium.common.exceptions import InvalidCookieDomainException, WebDriverException
+
+from helpers.fake_driver import FakeDriver, FakeElement
+from helpers.page_state import PageStateCache
+
+HOME = 'https://shop.example.com/'
+RESULTS = 'https://shop.example.com/s?k=teacups'
+READY = '.results'
+
+
+def results_page():
+    return FakeElement('html', children=[FakeElement('div', 'results', attributes={'class': 'results'})])
+
+
+def shop(builds, session_id=None):
+    """
+    A browser on a shop where searching (the build) takes two page loads and starts a session.
+    The cookies the browser had each time it loaded the results page are kept in driver.results_loaded_with
+    """
+    def results_loaded():
+        driver.results_loaded_with.append(dict(driver.cookies))
+        return results_page()
+
+    driver = FakeDriver(pages={HOME: lambda: FakeElement('html'), RESULTS: results_loaded})
+    driver.session_id = session_id
+    driver.results_loaded_with = []
+
+    def build(browser):
+        builds.append(browser)
+        browser.get(HOME)
+        browser.add_cookie({'name': 'session-id', 'value': 'abc', 'domain': '.example.com'})
+        browser.get(RESULTS)
+
+    return driver, build
+
+
+def without_devtools(driver):
+    def no_devtools(cmd, cmd_args):
+        raise WebDriverException('DevTools is not available')
+
+    driver.execute_cdp_cmd = no_devtools
+    return driver
+
+
+def test_page_state_restored_in_new_browser():
+    """
+    This test validates a cached state is restored (url & cookies) in another browser instead of being rebuilt
+    and is rebuilt once invalidated.
+    """
+    builds = []
+    cache = PageStateCache()
+    first, build = shop(builds)
+    cache.reach(first, (HOME, 'teacups'), build, READY)
+
+    second, _ = shop([])
+    cache.reach(second, (HOME, 'teacups'), build, READY)
+    assert builds == [first]
+    assert second.current_url == RESULTS
+    # the cookies are set through DevTools, only the results page is loaded
+    assert second.commands['get'] == 1
+    assert [cookies['session-id']['value'] for cookies in second.results_loaded_with] == ['abc']
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.invalidate((HOME, 'teacups'))
+    third, _ = shop([])
+    cache.reach(third, (HOME, 'teacups'), build, READY)
+    assert builds == [first, third]
+
+
+def test_page_state_restored_without_devtools():
+    """
+    This test validates a browser without DevTools opens the state's origin to be given its cookies, before the
+    state's page loads.
+    """
+    builds = []
+    cache = PageStateCache()
+    first, build = shop(builds)
+    cache.reach(first, (HOME, 'teacups'), build, READY)
+
+    second = without_devtools(shop([])[0])
+    cache.reach(second, (HOME, 'teacups'), build, READY)
+    assert builds == [first]
+    # the origin to set the cookies on, then the results page
+    assert second.commands['get'] == 2
+    assert [cookies['session-id']['value'] for cookies in second.results_loaded_with] == ['abc']
+
+
+def test_page_state_restored_in_same_browser():
+    """
+    This test validates restoring a state in the browser that captured it only navigates, in the same tab.
+    """
+    builds = []
+    cache = PageStateCache()
+    browser, build = shop(builds, session_id='soak')
+    cache.reach(browser, (HOME, 'teacups'), build, READY)
+    browser.get(HOME)
+    browser.commands.clear()
+
+    for _ in range(3):
+        cache.reach(browser, (HOME, 'teacups'), build, READY)
+    assert builds == [browser]
+    assert browser.commands['get'] == 3
+    assert browser.window_handles == ['main']
+    assert [cookies['session-id']['value'] for cookies in browser.results_loaded_with] == ['abc'] * 4
+
+
+def test_page_state_rebuilt_when_restore_fails(monkeypatch):
+    """
+    This test validates a state whose page never becomes ready after restoring is rebuilt.
+    """
+    monkeypatch.setattr('helpers.page_state.RESTORE_TIMEOUT', 0.1)
+    builds = []
+    cache = PageStateCache()
+    first, build = shop(builds)
+    cache.reach(first, (HOME, 'teacups'), build, READY)
+
+    # the results page no longer renders when loaded directly, e.g. the site needs the search form
+    second, _ = shop([])
+    second.pages[RESULTS] = lambda: FakeElement('html')
+    second.pages[HOME] = lambda: FakeElement('html')
+    rebuilt = []
+
+    def build_again(browser):
+        rebuilt.append(browser)
+        browser.set_document(results_page())
+
+    cache.reach(second, (HOME, 'teacups'), build_again, READY)
+    assert rebuilt == [second]
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+@pytest.mark.parametrize("error", (InvalidCookieDomainException('invalid cookie domain'),
+                                   WebDriverException('timeout: Timed out receiving message from renderer')))
+def test_page_state_rebuilt_when_the_browser_refuses_it(error):
+    """
+    This test validates a state is rebuilt when restoring it raises a webdriver error (cookies refused, page load
+    timing out...) instead of failing the test.
+    """
+    builds = []
+    cache = PageStateCache()
+    first, build = shop(builds)
+    cache.reach(first, (HOME, 'teacups'), build, READY)
+
+    second = without_devtools(shop([])[0])
+
+    def refuse(cookie):
+        raise error
+
+    second.add_cookie = refuse
+    cache.reach(second, (HOME, 'teacups'), lambda browser: browser.set_document(results_page()), READY)
+    assert (cache.hits, cache.misses) == (0, 2)
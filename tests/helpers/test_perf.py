@@ -0,0 +1,79 @@
+import pytest
+
+from helpers import perf
+from helpers.fake_driver import FakeDriver
+
+PAGE = 'https://shop.example.com/s?k=teacups#top'
+
+
+def page_sample(lcp_ms=1200.0, cls=0.05):
+    return {'url': PAGE, 'ttfb_ms': 80.0, 'dom_content_loaded_ms': 600.0, 'load_ms': 900.0, 'lcp_ms': lcp_ms,
+            'cls': cls, 'long_tasks': 1, 'long_task_ms': 70.0, 'resources': 12, 'transfer_kb': 340.0}
+
+
+@pytest.fixture
+def store(tmpdir):
+    store = perf.start_collecting(perf.PerfStore(str(tmpdir.join('perf', 'web_vitals.json'))))
+    yield store
+    perf.stop_collecting()
+
+
+def test_collect_adds_samples_per_url(store):
+    """
+    This test validates collect reads a sample with one script call and files it under the url without its query.
+    """
+    driver = FakeDriver()
+    driver.add_script_hook('PerformanceObserver', lambda driver: page_sample())
+
+    sample = perf.collect(driver, 'url.go_to_url')
+
+    assert driver.commands['executeAsyncScript'] == 1
+    assert sample['label'] == 'url.go_to_url'
+    assert list(store.samples) == ['https://shop.example.com/s']
+    perf.stop_collecting()
+    assert perf.collect(driver, 'url.go_to_url') is None
+    assert driver.commands['executeAsyncScript'] == 1
+
+
+def test_summary_saved_and_loaded_across_runs(store, monkeypatch):
+    """
+    This test validates samples are capped per url, and their p50/p95 survive saving & loading the store.
+    """
+    monkeypatch.setattr(perf, 'MAX_SAMPLES_PER_URL', 10)
+    for lcp_ms in range(1, 21):
+        store.add(page_sample(lcp_ms=float(lcp_ms)))
+    store.save()
+
+    loaded = perf.PerfStore(store.path)
+    assert len(loaded.samples['https://shop.example.com/s']) == 10
+    summary = loaded.summary()['https://shop.example.com/s']
+    assert summary['samples'] == 10
+    assert summary['lcp_ms'] == {'p50': 15.0, 'p95': 20.0}
+    assert summary['cls'] == {'p50': 0.05, 'p95': 0.05}
+
+
+def test_verify_thresholds():
+    """
+    This test validates thresholds pass at or below the maximum, fail above it and reject unknown metrics.
+    """
+    perf.verify_thresholds(page_sample(), {'lcp_ms': 1200, 'cls': 0.1})
+    perf.verify_thresholds(None, {'lcp_ms': 1})
+    perf.verify_thresholds(dict(page_sample(), lcp_ms=None), {'lcp_ms': 1})
+
+    with pytest.raises(AssertionError) as e:
+        perf.verify_thresholds(page_sample(lcp_ms=4100.0, cls=0.3), {'lcp_ms': 4000, 'cls': 0.25, 'long_tasks': 5})
+    assert "'lcp_ms': '4100.0 > 4000'" in str(e.value)
+    assert "'cls': '0.3 > 0.25'" in str(e.value)
+    assert 'long_tasks' not in str(e.value)
+
+    with pytest.raises(AssertionError) as e:
+        perf.verify_thresholds(page_sample(), {'fcp_ms': 1000})
+    assert 'fcp_ms' in str(e.value)
+
+
+def test_url_key():
+    """
+    This test validates samples of a page are grouped regardless of query string & fragment.
+    """
+    assert perf.url_key(PAGE) == 'https://shop.example.com/s'
+    assert perf.url_key('http://localhost:8000/dp/1?ref=x') == 'http://localhost:8000/dp/1'
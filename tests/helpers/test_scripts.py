@@ -0,0 +1,82 @@
+from collections import OrderedDict
+
+import pytest
+from selenium.webdriver.common.by import By
+
+from helpers import scripts
+from helpers.fake_driver import FakeDriver, FakeElement
+
+PAGE = 'https://shop.example.com/'
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """
+    A copy of the script registry, so scripts registered by a test do not outlive it
+    """
+    monkeypatch.setattr(scripts, '_registry', OrderedDict(scripts._registry))
+    monkeypatch.setattr(scripts, '_bundle', {})
+    scripts.register('scrollTopOf', 'function(element) { return element.scrollTop; }')
+
+
+def page():
+    return FakeElement('html', children=[FakeElement('div', attributes={'id': 'list'}, properties={'scrollTop': 120})])
+
+
+@pytest.fixture
+def driver():
+    fake = FakeDriver(page(), pages={PAGE: page})
+    fake.add_script_hook('scrollTop', lambda driver, element: element.properties['scrollTop'])
+    return fake, fake.find_element(By.ID, 'list')
+
+
+def test_scripts_injected_once_per_document(registry, driver):
+    """
+    This test validates a registered script is sent (alone, with its first call) on its first call in a document
+    only, and again after navigating or registering it again.
+    """
+    fake, element = driver
+    fake.add_script_hook('scrollLeft', lambda driver, element: 0)
+    scripts.stats.clear()
+    assert scripts.call(fake, 'scrollTopOf', element) == 120
+    assert fake.commands['executeScript'] == 1
+    assert scripts.stats['bytes_sent'] < len(scripts.bundle())
+
+    assert scripts.call(fake, 'scrollTopOf', element) == 120
+    assert fake.commands['executeScript'] == 2
+
+    scripts.register('scrollLeftOf', 'function(element) { return element.scrollLeft; }')
+    scripts.call(fake, 'scrollTopOf', element)
+    assert fake.commands['executeScript'] == 3
+    scripts.call(fake, 'scrollLeftOf', element)
+    assert fake.commands['executeScript'] == 4
+
+    scripts.register('scrollTopOf', 'function(element) { return element.scrollTop || 0; }')
+    scripts.call(fake, 'scrollTopOf', element)
+    assert fake.commands['executeScript'] == 5
+
+    # a document the driver was not told about costs one extra round trip
+    fake.get(PAGE)
+    assert scripts.call(fake, 'scrollTopOf', fake.find_element(By.ID, 'list')) == 120
+    assert fake.commands['executeScript'] == 7
+    assert scripts.call(fake, 'scrollLeftOf', fake.find_element(By.ID, 'list')) == 0
+    assert fake.commands['executeScript'] == 8
+
+    fake.get(PAGE)
+    scripts.forget(fake)
+    assert scripts.call(fake, 'scrollTopOf', fake.find_element(By.ID, 'list')) == 120
+    assert fake.commands['executeScript'] == 9
+
+
+def test_preloaded_scripts_are_never_injected(registry, driver):
+    """
+    This test validates scripts preloaded through DevTools are available in every new document without injecting.
+    """
+    fake, _ = driver
+    assert scripts.preload(fake)
+    assert scripts.preload(fake)
+    assert fake.commands['executeCdpCommand'] == 1
+
+    fake.get(PAGE)
+    assert scripts.call(fake, 'scrollTopOf', fake.find_element(By.ID, 'list')) == 120
+    assert fake.commands['executeScript'] == 1
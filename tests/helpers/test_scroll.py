@@ -0,0 +1,111 @@
+import time
+
+import pytest
+
+from helpers import scroll
+from helpers.exceptions import WebException
+from helpers.fake_driver import FakeDriver, FakeElement
+
+ITEM_HEIGHT = 50
+VIEWPORT_HEIGHT = 500
+
+
+def virtualized_list(count, oversized=(), clipped_px=0, appear_after=0):
+    """
+    A scrollable list that only renders (displays) the items within one viewport of its scroll position.
+    Items in oversized are taller than the viewport, clipped_px stops scrolling that far short of the end and
+    the items are only added appear_after seconds after the page loads.
+    """
+    container = FakeElement('ul', attributes={'id': 'list'},
+                            rect={'x': 0, 'y': 0, 'width': 300, 'height': VIEWPORT_HEIGHT},
+                            properties={'scrollTop': 0})
+    max_scroll = max(count * ITEM_HEIGHT - VIEWPORT_HEIGHT - clipped_px, 0)
+
+    def item_y(index):
+        return index * ITEM_HEIGHT - container.properties['scrollTop']
+
+    for i in range(count):
+        container.append(FakeElement(
+            'li', 'item {}'.format(i), attributes={'class': 'item'},
+            rect=lambda element, i=i: {'x': 0, 'y': item_y(i), 'width': 300,
+                                       'height': VIEWPORT_HEIGHT + ITEM_HEIGHT if i in oversized else ITEM_HEIGHT},
+            displayed=lambda element, i=i: -VIEWPORT_HEIGHT <= item_y(i) <= 2 * VIEWPORT_HEIGHT,
+            appear_after=appear_after))
+
+    def scroll_to(driver, element, position, horizontal):
+        if position is not None:
+            element.properties['scrollTop'] = min(max(position, 0), max_scroll)
+        return {'position': element.properties['scrollTop'], 'size': count * ITEM_HEIGHT, 'client': VIEWPORT_HEIGHT}
+
+    driver = FakeDriver(FakeElement('html', children=[container]))
+    driver.add_script_hook(scroll.SCROLL_TO_SCRIPT, scroll_to)
+    return driver, container
+
+
+@pytest.mark.parametrize("target_offset_px", (None, 150 * ITEM_HEIGHT))
+def test_jump_scrolling_takes_fewer_steps_than_fixed(target_offset_px):
+    """
+    This test validates jump scrolling finds an item far down a virtualized list in fewer steps than
+    fixed 100px steps would, whether or not the item's offset is known.
+    """
+    driver, container = virtualized_list(200)
+    stats = {}
+
+    element = scroll.scroll_until_visible(driver, container, '.item', delta_px=100, text='item 150',
+                                          strategy=scroll.JUMP, item_size_px=ITEM_HEIGHT,
+                                          target_offset_px=target_offset_px, stats=stats)
+
+    assert element.text == 'item 150'
+    assert stats['baseline_steps'] >= 70
+    assert stats['steps'] < stats['baseline_steps'] / 3, "Jump scrolling took too many steps: {}".format(stats)
+
+
+def test_jump_scrolling_stops_after_a_pass_without_new_content():
+    """
+    This test validates jump scrolling gives up after one full pass instead of cycling until the timeout
+    when the item never renders.
+    """
+    driver, container = virtualized_list(20)
+
+    started = time.monotonic()
+    with pytest.raises(WebException) as error:
+        scroll.scroll_until_visible(driver, container, '.item', text='item 99', strategy=scroll.JUMP, timeout=30)
+
+    assert time.monotonic() - started < 10
+    assert 'full scroll pass' in error.value.msg
+
+
+@pytest.mark.parametrize("oversized, clipped_px, reason", (
+    ((15,), 0, 'larger than the scrollable element'),
+    ((), 2 * ITEM_HEIGHT, 'past the end of the scrollable content'),
+))
+def test_jump_scrolling_stops_when_the_item_cannot_fit(oversized, clipped_px, reason):
+    """
+    This test validates jump scrolling gives up as soon as the rendered item is found to never fit inside the list
+    instead of refining 1px at a time until the timeout.
+    """
+    driver, container = virtualized_list(20, oversized=oversized, clipped_px=clipped_px)
+    target = 'item 15' if oversized else 'item 19'
+
+    started = time.monotonic()
+    with pytest.raises(WebException) as error:
+        scroll.scroll_until_visible(driver, container, '.item', text=target, strategy=scroll.JUMP, timeout=30)
+
+    assert time.monotonic() - started < 10
+    assert reason in error.value.msg
+
+
+@pytest.mark.parametrize("count", (5, 40))
+def test_jump_scrolling_waits_for_a_list_filled_in_later(count):
+    """
+    This test validates jump scrolling keeps waiting, up to its timeout, for a list whose items are added after
+    the wait started, whether or not the list scrolls.
+    """
+    driver, container = virtualized_list(count, appear_after=1)
+    target = 'item {}'.format(count - 2)
+
+    started = time.monotonic()
+    element = scroll.scroll_until_visible(driver, container, '.item', text=target, strategy=scroll.JUMP, timeout=5)
+
+    assert element.text == target
+    assert time.monotonic() - started >= 1
@@ -0,0 +1,74 @@
+import time
+
+import pytest
+from selenium.webdriver.common.by import By
+
+from helpers import dom, selector_health, wait
+from helpers.exceptions import WebException
+from helpers.fake_driver import FakeDriver, FakeElement
+
+PAGE = 'https://shop.example.com/'
+
+
+@pytest.fixture
+def driver(monkeypatch):
+    """
+    A registered page that has its search input but lost its cart icon
+    """
+    monkeypatch.setattr(selector_health, '_pages', {})
+    selector_health.register_pages({'shop home': {
+        'url': r'^https://shop\.example\.com/$',
+        'selectors': {'INPUT_FIELD': 'input#search', 'CART_ICON': '#cart'},
+    }})
+    selector_health.enable()
+
+    fake = FakeDriver(pages={PAGE: lambda: FakeElement('html', children=[
+        FakeElement('input', attributes={'id': 'search'}),
+        FakeElement('div', 'Deals', attributes={'class': 'deals'}, appear_after=0.2),
+    ])})
+    fake.add_script_hook('readyState', lambda driver, selectors, last_token, token: {
+        'url': driver.current_url,
+        'counts': [len(driver.find_elements(By.CSS_SELECTOR, selector)) for selector in selectors]})
+    fake.get(PAGE)
+    yield fake
+    selector_health.disable()
+
+
+def test_wait_on_missing_selector_fails_fast(driver):
+    """
+    This test validates waiting on a registered selector the page did not have fails straight away with a report.
+    """
+    started = time.monotonic()
+    with pytest.raises(WebException) as e:
+        wait.until_visible(driver, '#cart', timeout=10)
+
+    assert time.monotonic() - started < 1
+    assert 'MISSING  CART_ICON `#cart`' in str(e.value)
+    assert 'ok       INPUT_FIELD `input#search` x1' in str(e.value)
+
+
+def test_other_waits_unaffected(driver):
+    """
+    This test validates present and unregistered selectors are waited on as usual, counting the page once.
+    """
+    assert dom.get_element(driver, 'input#search')
+    assert wait.until_visible(driver, '.deals', timeout=2).text == 'Deals'
+    assert dom.get_element(driver, '.deals')
+    assert driver._selector_index['counts'] == {'INPUT_FIELD': 1, 'CART_ICON': 0}
+
+
+def test_multi_condition_waits_fail_fast(driver):
+    """
+    This test validates wait_all fails straight away when one selector is known to be missing, while wait_any
+    only does when every selector is.
+    """
+    started = time.monotonic()
+    with pytest.raises(WebException) as e:
+        dom.wait_all(driver, ['input#search', '#cart'], timeout=10)
+    assert time.monotonic() - started < 1
+    assert '`#cart` was not on the page' in str(e.value)
+
+    assert list(dom.wait_any(driver, ['#cart', '.deals'], timeout=2)) == ['.deals']
+    with pytest.raises(WebException):
+        dom.wait_any(driver, ['#cart'], timeout=10)
+    assert time.monotonic() - started < 2
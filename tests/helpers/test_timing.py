@@ -0,0 +1,15 @@
+from helpers.timing import percentile
+
+
+def test_percentile_nearest_rank():
+    """
+    This test validates percentile picks the nearest-rank value, including ranks that fall on a whole number.
+    """
+    assert percentile(range(1, 11), 50) == 5
+    assert percentile(range(1, 101), 99) == 99
+    assert percentile(range(1, 101), 95) == 95
+    assert percentile([3, 1, 2], 50) == 2
+    assert percentile([7], 95) == 7
+    assert percentile(range(1, 11), 0) == 1
+    assert percentile(range(1, 11), 100) == 10
+    assert percentile([], 50) is None
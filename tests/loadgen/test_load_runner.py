@@ -0,0 +1,106 @@
+import shutil
+
+import pytest
+
+from app_data.general.general import ENTER_KEY
+from helpers.fake_driver import FakeDriver, FakeElement
+from loadgen.flows import DEFAULT_SEARCH_TERM, FLOWS
+from loadgen.runner import FLOW_STEP, LoadRunner
+from loadgen.standin_server import StandInServer
+
+STOREFRONT = 'http://storefront.example.com/'
+PRODUCT_NAME = 'Porcelain Teacup Set'
+# seconds simulated pages take to show content after an action
+CONTENT_DELAY = 0.05
+
+
+def home_page():
+    def show_results(driver, element, value):
+        if ENTER_KEY in value:
+            driver.document.append(results(driver.elapsed() + CONTENT_DELAY))
+
+    return FakeElement('html', children=[
+        FakeElement('input', attributes={'id': 'twotabsearchtextbox'}, on_send_keys=show_results),
+    ])
+
+
+def results(appear_after):
+    return FakeElement('div', attributes={'class': 's-search-results'}, appear_after=appear_after, children=[
+        FakeElement('div', attributes={'cel_widget_id': 'UPPER-RESULT_INFO_BAR'}, children=[
+            FakeElement('span', '1-48 of over 30,000 results for "{}"'.format(DEFAULT_SEARCH_TERM),
+                        attributes={'class': 'sg-col-inner'})
+        ]),
+        FakeElement('div', attributes={'aria-label': "Amazon's Choice"}, children=[
+            FakeElement('span', "Amazon's Choice", attributes={'class': 'a-badge-region'},
+                        on_click=lambda driver, element: driver.set_document(product_page(driver.elapsed())))
+        ]),
+    ])
+
+
+def product_page(opened_at):
+    def show_view_cart_button(driver, element):
+        driver.document.append(FakeElement('a', attributes={'id': 'nav-view-cart'},
+                                           on_click=lambda d, e: d.set_document(cart_page())))
+
+    return FakeElement('html', children=[
+        FakeElement('span', PRODUCT_NAME, attributes={'id': 'productTitle'}),
+        FakeElement('input', attributes={'id': 'add-to-cart-button'}, appear_after=opened_at + CONTENT_DELAY,
+                    on_click=show_view_cart_button),
+    ])
+
+
+def cart_page():
+    return FakeElement('html', children=[FakeElement('span', PRODUCT_NAME, attributes={'class': 'sc-product-title'})])
+
+
+def fake_storefront(launched):
+    """
+    Driver factory launching FakeDrivers on a simulated storefront at STOREFRONT
+    """
+    def launch(user_data_dir):
+        driver = FakeDriver(pages={STOREFRONT: home_page})
+        launched.append(driver)
+        return driver
+
+    return launch
+
+
+def verify_summary(summary):
+    assert summary.get(FLOW_STEP, {}).get('count'), "No flow completed:\n{}".format(summary)
+    failed_steps = {name: stats['errors'] for name, stats in summary.items() if stats['errors']}
+    assert not failed_steps, "Steps failed under load:\n{}".format(failed_steps)
+    for step_name in ('url.go_to_url', 'amazon.do_search'):
+        assert summary[step_name]['p50_ms'] <= summary[step_name]['p99_ms']
+
+
+@pytest.mark.parametrize("flow_name", ("search", "search_and_add_to_cart"))
+def test_load_runner(flow_name):
+    """
+    This test validates the load runner replays a flow with concurrent users, one browser each, and reports
+    latency per step.
+    """
+    launched = []
+    runner = LoadRunner(FLOWS[flow_name], STOREFRONT, users=2, ramp_seconds=0.5, duration=3,
+                        driver_factory=fake_storefront(launched))
+    summary = runner.run()
+
+    verify_summary(summary)
+    assert len(launched) == 2
+    assert all(driver.commands['quit'] == 1 for driver in launched)
+
+
+@pytest.fixture
+def stand_in():
+    with StandInServer() as server:
+        yield server
+
+
+@pytest.mark.skipif(shutil.which('chromedriver') is None, reason='needs chrome & chromedriver on the PATH')
+@pytest.mark.parametrize("flow_name", ("search", "search_and_add_to_cart"))
+def test_load_runner_against_stand_in(stand_in, flow_name):
+    """
+    This test validates the load runner replays a flow in headless chrome against the stand-in storefront.
+    """
+    runner = LoadRunner(FLOWS[flow_name], stand_in.url, users=2, ramp_seconds=1, duration=10)
+
+    verify_summary(runner.run())
@@ -6,7 +6,8 @@ from helpers import dom, wait
 
 URL = {
     'link': 'https://www.google.com/',
-    'title': 'search'
+    'title': 'search',
+    'perf_thresholds': {'lcp_ms': 2500, 'cls': 0.1}
 }
 
 